@@ -3,17 +3,27 @@
 Handles loading settings from appsettings.json with sensible defaults.
 """
 
-import json
+import codecs
+import os
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
+
+try:
+    # Optional faster parser; its JSONDecodeError is a ValueError like json's
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 
 # Default instruction file names to look for (in priority order)
-DEFAULT_INSTRUCTION_FILE_NAMES = ["AGENTS.md"]
+DEFAULT_INSTRUCTION_FILE_NAMES: tuple[str, ...] = ("AGENTS.md",)
 
 # Default cooldown before a new cache clear is honoured (seconds)
 DEFAULT_NEW_SESSION_COOLDOWN_SECONDS: float = 30.0
 
+# Default number of file contents kept for line-range diffs
+DEFAULT_MAX_CACHED_CONTENTS: int = 256
+
 # Default character limit for pagination
 DEFAULT_READ_CHAR_LIMIT: int = 50000
 
@@ -45,18 +55,22 @@ Action required: Use the ask_user tool to check in with the user before continui
 """
 
 
-def load_instruction_file_names(config_dir: Path | None = None) -> List[str]:
-    """Load instruction file names from appsettings.json.
+# Parsed appsettings.json per file, with the (mtime_ns, size) it was parsed at
+_APPSETTINGS_CACHE: Dict[Path, tuple[tuple[int, int], Dict[str, Any]]] = {}
 
-    Reads the 'instructionFileNames' array from appsettings.json if it exists.
-    Falls back to DEFAULT_INSTRUCTION_FILE_NAMES if file doesn't exist or
-    property is missing.
+
+def _load_appsettings(config_dir: Path | None = None) -> Dict[str, Any]:
+    """Load appsettings.json, parsing it once per version of the file.
+
+    Every load_* function reads its setting from here, so the file is parsed
+    once at startup instead of once per setting. A changed mtime or size
+    triggers a re-parse. Missing, unreadable, or invalid files give {}.
 
     Args:
         config_dir: Directory containing appsettings.json. If None, uses script directory.
 
     Returns:
-        List of instruction file names in priority order.
+        The parsed settings object. Callers must not mutate it.
     """
     if config_dir is None:
         config_dir = Path(__file__).parent
@@ -64,17 +78,52 @@ def load_instruction_file_names(config_dir: Path | None = None) -> List[str]:
     config_path = config_dir / "appsettings.json"
 
     try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                file_names = config.get("instructionFileNames")
-                if isinstance(file_names, list) and len(file_names) > 0:
-                    return file_names
-    except (OSError, json.JSONDecodeError):
+        stat = os.stat(config_path)
+    except OSError:
+        return {}
+
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _APPSETTINGS_CACHE.get(config_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    try:
+        # Windows editors often save a UTF-8 BOM; json skips it but orjson rejects it
+        config = _json_loads(config_path.read_bytes().removeprefix(codecs.BOM_UTF8))
+    except (OSError, ValueError):
         # Config file corrupted or unreadable - use defaults
-        pass
+        config = {}
+    if not isinstance(config, dict):
+        config = {}
+
+    _APPSETTINGS_CACHE[config_path] = (version, config)
+    return config
 
-    return DEFAULT_INSTRUCTION_FILE_NAMES.copy()
+
+def clear_appsettings_cache() -> None:
+    """Forget all parsed appsettings.json files."""
+    _APPSETTINGS_CACHE.clear()
+
+
+def load_instruction_file_names(config_dir: Path | None = None) -> List[str]:
+    """Load instruction file names from appsettings.json.
+
+    Reads the 'instructionFileNames' array from appsettings.json if it exists.
+    Falls back to DEFAULT_INSTRUCTION_FILE_NAMES if file doesn't exist or
+    property is missing.
+
+    Args:
+        config_dir: Directory containing appsettings.json. If None, uses script directory.
+
+    Returns:
+        List of instruction file names in priority order.
+    """
+    config = _load_appsettings(config_dir)
+    file_names = config.get("instructionFileNames")
+    if isinstance(file_names, list) and len(file_names) > 0:
+        return list(file_names)
+
+    return list(DEFAULT_INSTRUCTION_FILE_NAMES)
 
 
 def load_new_session_cooldown_seconds(config_dir: Path | None = None) -> float:
@@ -90,22 +139,33 @@ def load_new_session_cooldown_seconds(config_dir: Path | None = None) -> float:
     Returns:
         Cooldown in seconds (float). Defaults to 30.0.
     """
-    if config_dir is None:
-        config_dir = Path(__file__).parent
+    config = _load_appsettings(config_dir)
+    value = config.get("newSessionCooldownSeconds")
+    if isinstance(value, (int, float)) and value >= 0:
+        return float(value)
 
-    config_path = config_dir / "appsettings.json"
+    return DEFAULT_NEW_SESSION_COOLDOWN_SECONDS
 
-    try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                value = config.get("newSessionCooldownSeconds")
-                if isinstance(value, (int, float)) and value >= 0:
-                    return float(value)
-    except (OSError, json.JSONDecodeError):
-        pass
 
-    return DEFAULT_NEW_SESSION_COOLDOWN_SECONDS
+def load_max_cached_contents(config_dir: Path | None = None) -> int:
+    """Load the number of file contents kept for diffing from appsettings.json.
+
+    Tracked files keep their full content so changes can be reported as line
+    ranges. Only the most recently used contents are kept; a change to a file
+    whose content was evicted is still detected, but reported as 1-EOF.
+
+    Args:
+        config_dir: Directory containing appsettings.json. If None, uses script directory.
+
+    Returns:
+        Maximum number of cached contents as integer. Defaults to 256.
+    """
+    config = _load_appsettings(config_dir)
+    value = config.get("maxCachedContents")
+    if type(value) is int and value > 0:
+        return value
+
+    return DEFAULT_MAX_CACHED_CONTENTS
 
 
 def load_read_char_limit(config_dir: Path | None = None) -> int:
@@ -121,20 +181,10 @@ def load_read_char_limit(config_dir: Path | None = None) -> int:
     Returns:
         Character limit as integer. Defaults to 50000.
     """
-    if config_dir is None:
-        config_dir = Path(__file__).parent
-
-    config_path = config_dir / "appsettings.json"
-
-    try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                value = config.get("readCharLimit")
-                if isinstance(value, int) and value > 0:
-                    return value
-    except (OSError, json.JSONDecodeError):
-        pass
+    config = _load_appsettings(config_dir)
+    value = config.get("readCharLimit")
+    if type(value) is int and value > 0:
+        return value
 
     return DEFAULT_READ_CHAR_LIMIT
 
@@ -151,20 +201,10 @@ def load_debug_client_info(config_dir: Path | None = None) -> bool:
     Returns:
         Boolean indicating if debug client info should be shown. Defaults to False.
     """
-    if config_dir is None:
-        config_dir = Path(__file__).parent
-
-    config_path = config_dir / "appsettings.json"
-
-    try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                value = config.get("debugClientInfo")
-                if isinstance(value, bool):
-                    return value
-    except (OSError, json.JSONDecodeError):
-        pass
+    config = _load_appsettings(config_dir)
+    value = config.get("debugClientInfo")
+    if isinstance(value, bool):
+        return value
 
     return DEFAULT_DEBUG_CLIENT_INFO
 
@@ -181,20 +221,10 @@ def load_allow_full_paths(config_dir: Path | None = None) -> bool:
     Returns:
         Boolean indicating if full paths are allowed. Defaults to False.
     """
-    if config_dir is None:
-        config_dir = Path(__file__).parent
-
-    config_path = config_dir / "appsettings.json"
-
-    try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                value = config.get("allowFullPaths")
-                if isinstance(value, bool):
-                    return value
-    except (OSError, json.JSONDecodeError):
-        pass
+    config = _load_appsettings(config_dir)
+    value = config.get("allowFullPaths")
+    if isinstance(value, bool):
+        return value
 
     return DEFAULT_ALLOW_FULL_PATHS
 
@@ -220,22 +250,35 @@ def load_client_overrides(config_dir: Path | None = None) -> dict:
     Returns:
         Dict mapping client names to their config overrides.
     """
-    if config_dir is None:
-        config_dir = Path(__file__).parent
+    config = _load_appsettings(config_dir)
+    overrides = config.get("clientOverrides")
+    if isinstance(overrides, dict):
+        return dict(overrides)
 
-    config_path = config_dir / "appsettings.json"
+    return {}
 
-    try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                overrides = config.get("clientOverrides")
-                if isinstance(overrides, dict):
-                    return overrides
-    except (OSError, json.JSONDecodeError):
-        pass
 
-    return {}
+# CLIENT_OVERRIDES keyed by lower-cased client name, with the dict it was built from
+_client_overrides_index: tuple[dict, Dict[str, dict]] | None = None
+
+
+def _get_client_override(client_name: str) -> dict | None:
+    """Look up a client's overrides by name, case-insensitively.
+
+    The lower-cased index is rebuilt whenever CLIENT_OVERRIDES is rebound to
+    a different dict, so each lookup is one str.lower() and one dict probe.
+    When two keys differ only by case, the first one wins.
+    """
+    global _client_overrides_index
+    overrides = CLIENT_OVERRIDES
+    index = _client_overrides_index
+    if index is None or index[0] is not overrides:
+        lowered: Dict[str, dict] = {}
+        for key, override in overrides.items():
+            if isinstance(override, dict):
+                lowered.setdefault(key.lower(), override)
+        index = _client_overrides_index = (overrides, lowered)
+    return index[1].get(client_name.lower())
 
 
 def get_response_footer(client_name: str | None = None) -> str:
@@ -253,13 +296,11 @@ def get_response_footer(client_name: str | None = None) -> str:
         The response footer string (may be empty, meaning disabled).
     """
     if client_name:
-        client_name_lower = client_name.lower()
-        for key, override in CLIENT_OVERRIDES.items():
-            if key.lower() == client_name_lower and isinstance(override, dict):
-                if "responseFooter" in override:
-                    value = override.get("responseFooter")
-                    if isinstance(value, str):
-                        return value
+        override = _get_client_override(client_name)
+        if override is not None:
+            value = override.get("responseFooter")
+            if isinstance(value, str):
+                return value
 
     return RESPONSE_FOOTER
 
@@ -279,13 +320,11 @@ def get_read_char_limit(client_name: str | None = None) -> int:
         Character limit as integer.
     """
     if client_name:
-        # Case-insensitive lookup: build a lower-case mapping
-        client_name_lower = client_name.lower()
-        for key, override in CLIENT_OVERRIDES.items():
-            if key.lower() == client_name_lower and isinstance(override, dict):
-                value = override.get("readCharLimit")
-                if isinstance(value, int) and value > 0:
-                    return value
+        override = _get_client_override(client_name)
+        if override is not None:
+            value = override.get("readCharLimit")
+            if type(value) is int and value > 0:
+                return value
 
     return READ_CHAR_LIMIT
 
@@ -303,20 +342,10 @@ def load_response_footer(config_dir: Path | None = None) -> str:
     Returns:
         The response footer string, or empty string if not configured.
     """
-    if config_dir is None:
-        config_dir = Path(__file__).parent
-
-    config_path = config_dir / "appsettings.json"
-
-    try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                value = config.get("responseFooter")
-                if isinstance(value, str):
-                    return value
-    except (OSError, json.JSONDecodeError):
-        pass
+    config = _load_appsettings(config_dir)
+    value = config.get("responseFooter")
+    if isinstance(value, str):
+        return value
 
     return DEFAULT_RESPONSE_FOOTER
 
@@ -333,26 +362,18 @@ def load_interrupt_message(config_dir: Path | None = None) -> str:
     Returns:
         The interrupt message string.
     """
-    if config_dir is None:
-        config_dir = Path(__file__).parent
-
-    config_path = config_dir / "appsettings.json"
-
-    try:
-        if config_path.is_file():
-            with config_path.open("r", encoding="utf-8") as f:
-                config = json.load(f)
-                value = config.get("interruptMessage")
-                if isinstance(value, str) and len(value) > 0:
-                    return value
-    except (OSError, json.JSONDecodeError):
-        pass
+    config = _load_appsettings(config_dir)
+    value = config.get("interruptMessage")
+    if isinstance(value, str) and len(value) > 0:
+        return value
 
     return DEFAULT_INTERRUPT_MESSAGE
 
 
 # Singleton: Load instruction file names at module import
 INSTRUCTION_FILE_NAMES: List[str] = load_instruction_file_names()
+# Same names as a set for membership tests; the list keeps priority order
+INSTRUCTION_FILE_NAME_SET: frozenset[str] = frozenset(INSTRUCTION_FILE_NAMES)
 READ_CHAR_LIMIT: int = load_read_char_limit()
 CLIENT_OVERRIDES: dict = load_client_overrides()
 DEBUG_CLIENT_INFO: bool = load_debug_client_info()
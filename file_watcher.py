@@ -3,101 +3,124 @@
 Provides line-level diff tracking to detect external modifications.
 """
 
-from difflib import unified_diff
+import os
+from collections import defaultdict
+from difflib import SequenceMatcher
 from pathlib import Path
 from typing import Any, Dict, List
 
-from path_utils import get_file_mtime_ms
+from path_utils import stat_mtime_ms
 from session_state import session
 
 
 def calculate_changed_line_ranges(old_content: str, new_content: str) -> str:
     """Calculate which line ranges changed between two versions.
 
-    Uses difflib to identify changed lines and returns ranges like "5-8,15-20".
+    Trims the common leading and trailing lines first, then uses difflib only
+    on the span in between, and returns ranges like "5-8,15-20" in the new file.
 
     Args:
         old_content: Previous file content.
         new_content: Current file content.
 
     Returns:
-        String with changed line ranges (e.g. "5-8,15-20") or "1-EOF" if diff fails.
+        String with changed line ranges (e.g. "5-8,15-20") or "1-EOF" if nothing can be pinpointed.
     """
     if not old_content and not new_content:
         return "1-EOF"
 
-    try:
-        old_lines = old_content.splitlines(keepends=False)
-        new_lines = new_content.splitlines(keepends=False)
+    old_lines = old_content.splitlines(keepends=False)
+    new_lines = new_content.splitlines(keepends=False)
+
+    # Skip the unchanged head and tail with plain list compares; a typical
+    # edit leaves only a few lines in between for the matcher to align.
+    start = 0
+    limit = min(len(old_lines), len(new_lines))
+    while start < limit and old_lines[start] == new_lines[start]:
+        start += 1
+
+    old_end = len(old_lines)
+    new_end = len(new_lines)
+    while old_end > start and new_end > start and old_lines[old_end - 1] == new_lines[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    if new_end == start:
+        # Only deletions: no line in the new file is new
+        return f"1-{len(new_lines)}" if new_lines else "1-EOF"
+
+    # Changed spans as 0-based [start, end) offsets into new_lines
+    if old_end == start:
+        # Pure insertion: one span, no alignment needed
+        spans = [(start, new_end)]
+    else:
+        matcher = SequenceMatcher(None, old_lines[start:old_end], new_lines[start:new_end])
+        spans = [(start + j1, start + j2) for tag, _, _, j1, j2 in matcher.get_opcodes() if tag in ("replace", "insert")]
+        if not spans:
+            return f"1-{len(new_lines)}"
+
+    # Merge touching spans and format as 1-based line ranges
+    ranges: list[str] = []
+    range_start, range_end = spans[0]
+    for span_start, span_end in spans[1:]:
+        if span_start == range_end:
+            range_end = span_end
+            continue
+        ranges.append(str(range_end) if range_end - range_start == 1 else f"{range_start + 1}-{range_end}")
+        range_start, range_end = span_start, span_end
+    ranges.append(str(range_end) if range_end - range_start == 1 else f"{range_start + 1}-{range_end}")
+
+    return ",".join(ranges)
+
+
+# Only Windows directory listings carry stat data; elsewhere DirEntry.stat()
+# is a stat call per entry on top of reading the whole directory.
+_STAT_FROM_LISTINGS: bool = os.name == "nt"
 
-        # Generate unified diff with context=0 to minimize output
-        diff = list(unified_diff(old_lines, new_lines, lineterm="", n=0))
 
-        # Track changed line numbers in new file
-        changed_lines: set[int] = set()
-        current_line_num: int | None = None
+def _stat_tracked_files(paths: List[str]) -> Dict[str, os.stat_result]:
+    """Stat tracked files, listing each directory once where that saves calls.
+
+    On Windows, directories holding several tracked files are read with
+    os.scandir, whose entries carry their stat data without a call per file.
+    Everything else (other platforms, lone files, names a listing does not
+    return as-is) is stat'ed directly.
+
+    Args:
+        paths: Absolute paths of tracked files.
 
-        for line in diff:
-            if line.startswith("@@"):
-                # Parse @@ -old_start,old_count +new_start,new_count @@
+    Returns:
+        Dict mapping each path that could be stat'ed to its stat result.
+        Missing or unreadable files are left out.
+    """
+    by_dir: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for path in paths:
+        parent, name = os.path.split(path)
+        by_dir[parent][name] = path
+
+    stats: Dict[str, os.stat_result] = {}
+    for parent, names in by_dir.items():
+        if _STAT_FROM_LISTINGS and len(names) > 1:
+            try:
+                with os.scandir(parent) as entries:
+                    for entry in entries:
+                        path = names.get(entry.name)
+                        if path is not None:
+                            try:
+                                stats[path] = entry.stat()
+                            except OSError:
+                                pass
+            except OSError:
+                pass
+
+        for path in names.values():
+            if path not in stats:
                 try:
-                    # Extract +new_start,new_count part
-                    parts = line.split()
-                    if len(parts) < 3:
-                        continue
-                    new_range = parts[2]  # Format: +start,count or +start
-                    new_start = int(new_range.lstrip("+").split(",")[0])
-                    current_line_num = new_start
-                except (ValueError, IndexError):
-                    current_line_num = None
-                    continue
-            elif current_line_num is not None and (line.startswith("+") or line.startswith("-")):
-                # Added or removed line - mark as changed
-                if line.startswith("+"):
-                    changed_lines.add(current_line_num)
-                    current_line_num += 1
-                elif line.startswith("-"):
-                    # Line was removed - don't increment, it affects alignment
+                    stats[path] = os.stat(path)
+                except OSError:
                     pass
-                else:
-                    current_line_num += 1
-            elif current_line_num is not None and not line.startswith(("@@", "\\")) and line:
-                # Context line - increment line number but don't mark as changed
-                current_line_num += 1
-
-        if not changed_lines:
-            return f"1-{len(new_lines)}" if new_lines else "1-EOF"
-
-        # Build ranges from changed lines
-        sorted_lines = sorted(changed_lines)
-        ranges: list[str] = []
-        range_start = sorted_lines[0]
-        range_end = sorted_lines[0]
-
-        for line_num in sorted_lines[1:]:
-            if line_num == range_end + 1:
-                # Contiguous range
-                range_end = line_num
-            else:
-                # Gap - save current range and start new one
-                if range_start == range_end:
-                    ranges.append(str(range_start))
-                else:
-                    ranges.append(f"{range_start}-{range_end}")
-                range_start = line_num
-                range_end = line_num
-
-        # Save final range
-        if range_start == range_end:
-            ranges.append(str(range_start))
-        else:
-            ranges.append(f"{range_start}-{range_end}")
-
-        return ",".join(ranges)
-
-    except Exception:
-        # Fallback to simple "entire file" if diff fails
-        return "1-EOF"
+
+    return stats
 
 
 def get_changed_files() -> List[Dict[str, Any]]:
@@ -111,55 +134,61 @@ def get_changed_files() -> List[Dict[str, Any]]:
         Empty list if no files have changed.
     """
     changed: List[Dict[str, Any]] = []
+    tracked = list(session.mtimes.items())
+    stats = _stat_tracked_files([tracked_path for tracked_path, _ in tracked])
 
-    for tracked_path, old_mtime in list(session.mtimes.items()):
-        file_path = Path(tracked_path)
-
-        if not file_path.exists():
-            # File was deleted; report it once, then stop tracking it.
+    for tracked_path, old_mtime in tracked:
+        file_stat = stats.get(tracked_path)
+        if file_stat is None:
+            # File was deleted or became unreadable; report it once, then stop tracking it.
             changed.append({"path": tracked_path, "status": "deleted"})
             session.untrack_file(tracked_path)
             continue
 
-        try:
-            current_mtime = get_file_mtime_ms(file_path)
-        except OSError:
-            # File became unreadable; treat it like a one-time deletion notice.
-            changed.append({"path": tracked_path, "status": "deleted"})
-            session.untrack_file(tracked_path)
-            continue
+        current_mtime = stat_mtime_ms(file_stat)
+        current_size = file_stat.st_size
 
-        if current_mtime > old_mtime:
-            # File was modified; read content and calculate changed lines
-            changed_line_ranges = "1-EOF"
-            try:
-                new_content = file_path.read_text(encoding="utf-8")
-
-                # Get old content if available
-                old_content = session.contents.get(tracked_path, "")
-
-                # Calculate which lines changed
-                if old_content:
-                    changed_line_ranges = calculate_changed_line_ranges(old_content, new_content)
-
-                # Update cached content
-                session.contents[tracked_path] = new_content
-            except (OSError, UnicodeDecodeError):
-                pass
+        # Same (mtime, size) as when tracked: skip without reading the file
+        if current_mtime < old_mtime or session.is_unchanged(tracked_path, current_mtime, current_size):
+            continue
 
-            # Calculate seconds since file was modified
-            seconds_ago = (current_mtime - old_mtime) / 1000
-
-            changed.append(
-                {
-                    "path": tracked_path,
-                    "status": "modified",
-                    "changedLineRanges": changed_line_ranges,
-                    "secondsAgo": int(seconds_ago) if seconds_ago >= 1 else f"{seconds_ago:.2f}",
-                }
-            )
-            # Update the tracked mtime so we don't report this change again
-            session.mtimes[tracked_path] = current_mtime
+        # File was modified; read content and calculate changed lines
+        changed_line_ranges = "1-EOF"
+        try:
+            new_content = Path(tracked_path).read_text(encoding="utf-8")
+
+            # Touched but not changed: take the new stat and report nothing
+            if session.has_same_content(tracked_path, new_content):
+                session.mtimes[tracked_path] = current_mtime
+                session.sizes[tracked_path] = current_size
+                continue
+
+            # Get old content if available
+            old_content = session.contents.get(tracked_path, "")
+
+            # Calculate which lines changed
+            if old_content:
+                changed_line_ranges = calculate_changed_line_ranges(old_content, new_content)
+
+            # Update cached content
+            session.remember_content(tracked_path, new_content)
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        # Calculate seconds since file was modified
+        seconds_ago = (current_mtime - old_mtime) / 1000
+
+        changed.append(
+            {
+                "path": tracked_path,
+                "status": "modified",
+                "changedLineRanges": changed_line_ranges,
+                "secondsAgo": int(seconds_ago) if seconds_ago >= 1 else f"{seconds_ago:.2f}",
+            }
+        )
+        # Update the tracked stat so we don't report this change again
+        session.mtimes[tracked_path] = current_mtime
+        session.sizes[tracked_path] = current_size
 
     return changed
 
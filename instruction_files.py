@@ -8,12 +8,12 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
-from config import INSTRUCTION_FILE_NAMES
+from config import INSTRUCTION_FILE_NAME_SET, INSTRUCTION_FILE_NAMES
 from path_utils import get_base_dir
 from session_state import session
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InstructionFileRenderItem:
     """A single instruction file and how it should be surfaced in a read."""
 
@@ -45,12 +45,15 @@ def find_instruction_files_in_parents(target_path: Path) -> List[tuple[Path, Pat
     found: List[tuple[Path, Path]] = []
     base_dir = get_base_dir()
 
-    # Start from parent of file (or the path itself if it's a directory)
-    current = target_path.parent if target_path.is_file() else target_path
+    # Start from parent of file (or the path itself if it's a directory).
+    # Resolve once up front: parents of a resolved path are already resolved,
+    # so the walk compares paths structurally instead of resolving per level.
+    current = (target_path.parent if target_path.is_file() else target_path).resolve()
+    resolved_base = base_dir.resolve()
 
     while True:
         # Stop if we've reached BASE_DIR
-        if current.resolve() == base_dir.resolve():
+        if current == resolved_base:
             break
 
         # Check for instruction files in priority order
@@ -157,5 +160,5 @@ def mark_instruction_content_appended_if_applicable(target_file: Path) -> None:
     Args:
         target_file: Path to the file being operated on.
     """
-    if target_file.name in INSTRUCTION_FILE_NAMES:
+    if target_file.name in INSTRUCTION_FILE_NAME_SET:
         session.mark_instruction_content_appended(str(target_file.parent))
@@ -83,9 +83,11 @@ class TrayApp:
                     session_id,
                     msg.get("summary", ""),
                 )
-                self.store.update(session_id, {
-                    "last_tool": msg.get("summary", msg.get("tool", "")),
-                })
+                fields = {"last_tool": msg.get("summary", msg.get("tool", ""))}
+                for key in ("client_name", "files_tracked"):
+                    if key in msg:
+                        fields[key] = msg[key]
+                self.store.update(session_id, fields)
             elif msg_type == "unregister":
                 logger.info("Session unregistered: %s", session_id)
                 self.store.unregister(session_id)
@@ -3,17 +3,25 @@
 Stores active lineage-mcp sessions, grouped by base_dir.
 """
 
+import bisect
 import logging
 import os
+import sys
 import threading
 import time
-from collections import defaultdict
 from dataclasses import dataclass, field
+from operator import attrgetter
 from datetime import datetime
-from typing import Optional
+from types import MappingProxyType
+from typing import Iterable, Mapping, NamedTuple, Optional
 
 logger = logging.getLogger("lineage_tray.session_store")
 
+_started_at_ns = attrgetter("started_at_ns")
+
+# System PIDs excluded from ancestor matching
+_SYSTEM_PIDS = frozenset((0, 4))
+
 
 # Known process names → inferred client name.
 # Checked against ancestor_names during registration when client_name
@@ -28,6 +36,10 @@ PROCESS_CLIENT_MAP: dict[str, str] = {
 }
 
 
+# infer_client_from_ancestors and _find_client_pid deliberately stay plain
+# Python: they walk a handful of short strings through a dict lookup, which
+# a JIT such as numba cannot speed up (it has no fast path for str lists),
+# while its import alone would add hundreds of milliseconds to tray startup.
 def infer_client_from_ancestors(ancestor_names: list[str]) -> str | None:
     """Infer client name from ancestor process names.
 
@@ -70,6 +82,14 @@ def _find_client_pid(
     return None
 
 
+# SessionInfo fields that feed each cached display property. Assigning any
+# of them drops the matching cache so the next read recomputes it.
+_DISPLAY_NAME_FIELDS = frozenset(
+    ("interrupted", "client_name", "pid", "last_tool", "first_call")
+)
+_ANCESTOR_CHAIN_FIELDS = frozenset(("pid", "ancestor_pids", "ancestor_names"))
+
+
 @dataclass
 class SessionInfo:
     """Represents one active lineage-mcp session."""
@@ -86,11 +106,65 @@ class SessionInfo:
     interrupted: bool = False
     ancestor_pids: list[int] = field(default_factory=list)
     ancestor_names: list[str] = field(default_factory=list)
+    # Integer copy of started_at (epoch ns) used for ordering within a
+    # base_dir group; derived whenever started_at is assigned.
+    started_at_ns: int = field(init=False, repr=False, compare=False)
+    # (started_at, formatted) pair backing since_str; keyed on started_at
+    # because a reconnecting session re-registers with a new timestamp.
+    _since_cache: Optional[tuple[float, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _display_name_cache: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _ancestor_chain_cache: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Normalized, case-folded base_dir used by find_by_filter comparisons.
+    _base_dir_key: str = field(default="", init=False, repr=False, compare=False)
+    # Lower-cased client_name used by find_by_filter substring matching.
+    _client_name_lower: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Re-assign through __setattr__ so the derived lookup keys are set.
+        self.base_dir = self.base_dir
+        self.client_name = self.client_name
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == "base_dir":
+            # Many sessions share a handful of workspace roots; interning
+            # lets them share one string and makes dict lookups cheap.
+            value = sys.intern(value)
+            object.__setattr__(
+                self, "_base_dir_key", sys.intern(os.path.normpath(value).lower())
+            )
+        elif name == "started_at":
+            object.__setattr__(self, "started_at_ns", int(value * 1_000_000_000))
+        elif name == "client_name":
+            object.__setattr__(
+                self, "_client_name_lower", value.lower() if value else value
+            )
+        object.__setattr__(self, name, value)
+        if name in _DISPLAY_NAME_FIELDS:
+            object.__setattr__(self, "_display_name_cache", None)
+        if name in _ANCESTOR_CHAIN_FIELDS:
+            object.__setattr__(self, "_ancestor_chain_cache", None)
 
     @property
     def since_str(self) -> str:
-        """Human-readable 'since' string."""
-        return datetime.fromtimestamp(self.started_at).strftime("%I:%M %p")
+        """Human-readable 'since' string.
+
+        Formatted once per started_at value, since the menu re-reads it
+        for every session on every redraw.
+        """
+        cached = self._since_cache
+        if cached is not None and cached[0] == self.started_at:
+            return cached[1]
+        formatted = time.strftime("%I:%M %p", time.localtime(self.started_at))
+        self._since_cache = (self.started_at, formatted)
+        return formatted
 
     @property
     def ancestor_chain_str(self) -> str:
@@ -98,23 +172,33 @@ class SessionInfo:
 
         Returns something like: 'python.exe(1234) → pwsh.exe(5678) → Code.exe(9012)'
         """
+        cached = self._ancestor_chain_cache
+        if cached is not None:
+            return cached
         if not self.ancestor_pids:
-            return f"PID {self.pid} (no chain)"
-        parts = []
-        for i, pid in enumerate(self.ancestor_pids):
-            name = self.ancestor_names[i] if i < len(self.ancestor_names) else "?"
-            parts.append(f"{name}({pid})")
-        return " → ".join(parts)
+            chain = f"PID {self.pid} (no chain)"
+        else:
+            parts = []
+            for i, pid in enumerate(self.ancestor_pids):
+                name = self.ancestor_names[i] if i < len(self.ancestor_names) else "?"
+                parts.append(f"{name}({pid})")
+            chain = " → ".join(parts)
+        self._ancestor_chain_cache = chain
+        return chain
 
     @property
     def display_name(self) -> str:
         """Short display name for menu."""
+        cached = self._display_name_cache
+        if cached is not None:
+            return cached
         prefix = "⛔ " if self.interrupted else "✅ "
         name = self.client_name or f"PID {self.pid}"
         tool = self.last_tool or self.first_call
         if tool:
             name += f" {tool}"
-        return prefix + name
+        self._display_name_cache = prefix + name
+        return self._display_name_cache
 
 
 @dataclass
@@ -140,49 +224,96 @@ class CompactionEvent:
         return f"[{self.time_str}] {name} - {self.files_tracked} files"
 
 
+class _Snapshot(NamedTuple):
+    """Immutable view of the store's membership, published after mutations."""
+
+    sessions: dict[str, SessionInfo]
+    by_dir: Mapping[str, tuple[SessionInfo, ...]]
+
+
 class SessionStore:
-    """Thread-safe in-memory registry of active sessions, grouped by base_dir."""
+    """Thread-safe in-memory registry of active sessions, grouped by base_dir.
+
+    Writers serialize on ``_lock`` and publish a fresh ``_Snapshot`` whenever
+    membership or grouping changes. Readers (the menu thread) just load
+    ``_snapshot`` - a single attribute read, atomic under the GIL - and never
+    contend with the pipe threads delivering updates. Field updates mutate
+    the shared SessionInfo objects in place, as before.
+    """
 
     def __init__(self) -> None:
         self._sessions: dict[str, SessionInfo] = {}  # session_id → SessionInfo
+        # base_dir → sessions kept sorted by started_at, maintained on every
+        # mutation so get_grouped() doesn't regroup and resort per redraw.
+        self._by_dir: dict[str, list[SessionInfo]] = {}
         self._lock = threading.Lock()
+        self._dirty = False
+        self._snapshot = _Snapshot({}, MappingProxyType({}))
 
-    def register(self, data: dict) -> None:
+    def register(self, data: dict | None = None, /, **fields: object) -> None:
         """Register or update a session.
 
+        Fields may be passed as a dict (as received from the pipe), as
+        keyword arguments, or both; keywords win on conflict.
+
         Args:
-            data: Dict with session fields. Must include 'session_id'.
+            data: Dict with session fields. Must include 'session_id'
+                  unless it is passed as a keyword.
+            **fields: Additional session fields.
         """
+        if fields:
+            data = {**data, **fields} if data else fields
         with self._lock:
-            session_id = data["session_id"]
-            if session_id in self._sessions:
-                # Update existing (reconnection case)
-                for k, v in data.items():
-                    if k != "type" and v is not None:
-                        setattr(self._sessions[session_id], k, v)
-                self._sessions[session_id].last_seen = time.time()
-                logger.debug(
-                    "Re-registered session %s (interrupted=%s)",
-                    session_id,
-                    self._sessions[session_id].interrupted,
-                )
-            else:
-                # New registration - filter out 'type' key
-                init_data = {k: v for k, v in data.items() if k != "type"}
-                session = SessionInfo(**init_data)
-                # Infer client name from ancestor processes if not provided
-                if not session.client_name and session.ancestor_names:
-                    session.client_name = infer_client_from_ancestors(
-                        session.ancestor_names
-                    )
-                self._sessions[session_id] = session
-                logger.debug(
-                    "New session %s: pid=%s, client=%s, interrupted=%s",
-                    session_id,
-                    session.pid,
-                    session.client_name,
-                    session.interrupted,
+            self._register_unlocked(data)
+            self._publish_if_dirty()
+
+    def register_many(self, records: Iterable[dict]) -> None:
+        """Register or update several sessions under a single lock acquisition.
+
+        Args:
+            records: Dicts with session fields, as accepted by register().
+        """
+        with self._lock:
+            for data in records:
+                self._register_unlocked(data)
+            self._publish_if_dirty()
+
+    def _register_unlocked(self, data: dict) -> None:
+        """Apply one registration. Caller must hold self._lock."""
+        session_id = data["session_id"]
+        existing = self._sessions.get(session_id)
+        if existing is not None:
+            # Update existing (reconnection case)
+            old_dir, old_started = existing.base_dir, existing.started_at_ns
+            for k, v in data.items():
+                if k != "type" and v is not None:
+                    setattr(existing, k, v)
+            existing.last_seen = time.time()
+            self._reindex_if_moved(existing, old_dir, old_started)
+            logger.debug(
+                "Re-registered session %s (interrupted=%s)",
+                session_id,
+                existing.interrupted,
+            )
+        else:
+            # New registration - filter out 'type' key
+            if "type" in data:
+                data = {k: v for k, v in data.items() if k != "type"}
+            session = SessionInfo(**data)
+            # Infer client name from ancestor processes if not provided
+            if not session.client_name and session.ancestor_names:
+                session.client_name = infer_client_from_ancestors(
+                    session.ancestor_names
                 )
+            self._sessions[session_id] = session
+            self._index_add(session)
+            logger.debug(
+                "New session %s: pid=%s, client=%s, interrupted=%s",
+                session_id,
+                session.pid,
+                session.client_name,
+                session.interrupted,
+            )
 
     def unregister(self, session_id: str) -> None:
         """Remove a session.
@@ -191,7 +322,10 @@ class SessionStore:
             session_id: The session to remove.
         """
         with self._lock:
-            self._sessions.pop(session_id, None)
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._index_remove(session, session.base_dir)
+            self._publish_if_dirty()
 
     def update(self, session_id: str, data: dict) -> None:
         """Update fields of an existing session.
@@ -201,26 +335,85 @@ class SessionStore:
             data: Dict of fields to update.
         """
         with self._lock:
-            if session_id in self._sessions:
-                for k, v in data.items():
-                    if k not in ("type", "session_id") and v is not None:
-                        setattr(self._sessions[session_id], k, v)
-                self._sessions[session_id].last_seen = time.time()
+            self._update_unlocked(session_id, data)
+            self._publish_if_dirty()
+
+    def update_many(self, patches: Iterable[tuple[str, dict]]) -> None:
+        """Update several sessions under a single lock acquisition.
+
+        Args:
+            patches: (session_id, data) pairs, as accepted by update().
+                     Unknown session IDs are ignored.
+        """
+        with self._lock:
+            for session_id, data in patches:
+                self._update_unlocked(session_id, data)
+            self._publish_if_dirty()
+
+    def _update_unlocked(self, session_id: str, data: dict) -> None:
+        """Apply one update. Caller must hold self._lock."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        old_dir, old_started = session.base_dir, session.started_at_ns
+        for k, v in data.items():
+            if k not in ("type", "session_id") and v is not None:
+                setattr(session, k, v)
+        session.last_seen = time.time()
+        self._reindex_if_moved(session, old_dir, old_started)
+
+    def _index_add(self, session: SessionInfo) -> None:
+        """Insert a session into its base_dir group. Caller must hold self._lock."""
+        bisect.insort(
+            self._by_dir.setdefault(session.base_dir, []),
+            session,
+            key=_started_at_ns,
+        )
+        self._dirty = True
+
+    def _index_remove(self, session: SessionInfo, base_dir: str) -> None:
+        """Remove a session from a base_dir group. Caller must hold self._lock."""
+        self._dirty = True
+        group = self._by_dir.get(base_dir)
+        if group is None:
+            return
+        for i, member in enumerate(group):
+            if member is session:
+                del group[i]
+                break
+        if not group:
+            del self._by_dir[base_dir]
+
+    def _publish_if_dirty(self) -> None:
+        """Swap in a new snapshot if membership changed. Caller must hold self._lock."""
+        if not self._dirty:
+            return
+        self._snapshot = _Snapshot(
+            dict(self._sessions),
+            MappingProxyType(
+                {base_dir: tuple(group) for base_dir, group in self._by_dir.items()}
+            ),
+        )
+        self._dirty = False
+
+    def _reindex_if_moved(
+        self, session: SessionInfo, old_dir: str, old_started: int
+    ) -> None:
+        """Reposition a session whose grouping or sort key changed."""
+        if session.base_dir != old_dir or session.started_at_ns != old_started:
+            self._index_remove(session, old_dir)
+            self._index_add(session)
 
-    def get_grouped(self) -> dict[str, list[SessionInfo]]:
+    def get_grouped(self) -> Mapping[str, tuple[SessionInfo, ...]]:
         """Return sessions grouped by base_dir, sorted by started_at.
 
+        The result is the current snapshot itself (a read-only mapping of
+        tuples), so repeated calls between mutations allocate nothing.
+
         Returns:
-            Dict mapping base_dir strings to lists of SessionInfo.
+            Read-only mapping of base_dir strings to tuples of SessionInfo.
         """
-        with self._lock:
-            groups: dict[str, list[SessionInfo]] = defaultdict(list)
-            for s in self._sessions.values():
-                groups[s.base_dir].append(s)
-            # Sort each group by started_at
-            for key in groups:
-                groups[key].sort(key=lambda s: s.started_at)
-            return dict(groups)
+        return self._snapshot.by_dir
 
     def get(self, session_id: str) -> SessionInfo | None:
         """Get a specific session.
@@ -231,14 +424,12 @@ class SessionStore:
         Returns:
             SessionInfo if found, None otherwise.
         """
-        with self._lock:
-            return self._sessions.get(session_id)
+        return self._snapshot.sessions.get(session_id)
 
     @property
     def count(self) -> int:
         """Number of active sessions."""
-        with self._lock:
-            return len(self._sessions)
+        return len(self._snapshot.sessions)
 
     def find_by_filter(
         self,
@@ -272,9 +463,6 @@ class SessionStore:
         Returns:
             List of matching SessionInfo objects.
         """
-        # System PIDs excluded from ancestor matching
-        system_pids = {0, 4}
-
         # Identify the hook's client PID (if possible)
         hook_client_pid: int | None = None
         if ancestor_pids and ancestor_names:
@@ -286,61 +474,69 @@ class SessionStore:
             base_dir, client_name, hook_client_pid, ancestor_pids,
         )
 
-        with self._lock:
-            matches = []
-            for session in self._sessions.values():
-                if base_dir is not None:
-                    # Normalize both paths for comparison
-                    session_dir = os.path.normpath(session.base_dir)
-                    filter_dir = os.path.normpath(base_dir)
-                    if session_dir.lower() != filter_dir.lower():
-                        continue
-
-                if ancestor_pids is not None and session.ancestor_pids:
-                    # Identify the session's client PID
-                    session_client_pid = _find_client_pid(
-                        session.ancestor_pids, session.ancestor_names
-                    )
+        # Hoist per-call invariants out of the session loop; sessions carry
+        # a precomputed base_dir key
+        filter_dir_key = (
+            os.path.normpath(base_dir).lower() if base_dir is not None else None
+        )
+        hook_set = (
+            frozenset(ancestor_pids) - _SYSTEM_PIDS
+            if ancestor_pids is not None
+            else frozenset()
+        )
+        client_needle = client_name.lower() if client_name is not None else None
+
+        snapshot = self._snapshot
+        matches = []
+        for session in snapshot.sessions.values():
+            if filter_dir_key is not None:
+                if session._base_dir_key != filter_dir_key:
+                    continue
+
+            if ancestor_pids is not None and session.ancestor_pids:
+                # Identify the session's client PID
+                session_client_pid = _find_client_pid(
+                    session.ancestor_pids, session.ancestor_names
+                )
 
-                    if hook_client_pid is not None and session_client_pid is not None:
-                        # Both have identifiable clients - match by client PID
-                        if hook_client_pid != session_client_pid:
-                            logger.debug(
-                                "  SKIP %s (%s): client PID %d != hook PID %d",
-                                session.session_id,
-                                session.client_name,
-                                session_client_pid,
-                                hook_client_pid,
-                            )
-                            continue
+                if hook_client_pid is not None and session_client_pid is not None:
+                    # Both have identifiable clients - match by client PID
+                    if hook_client_pid != session_client_pid:
                         logger.debug(
-                            "  MATCH %s (%s): client PID %d",
+                            "  SKIP %s (%s): client PID %d != hook PID %d",
                             session.session_id,
                             session.client_name,
                             session_client_pid,
+                            hook_client_pid,
                         )
-                    else:
-                        # Fallback: generic overlap minus system PIDs
-                        hook_set = set(ancestor_pids) - system_pids
-                        session_set = set(session.ancestor_pids) - system_pids
-                        overlap = hook_set & session_set
-                        if not overlap:
-                            logger.debug(
-                                "  SKIP %s (%s): no ancestor overlap",
-                                session.session_id,
-                                session.client_name,
-                            )
-                            continue
+                        continue
+                    logger.debug(
+                        "  MATCH %s (%s): client PID %d",
+                        session.session_id,
+                        session.client_name,
+                        session_client_pid,
+                    )
+                else:
+                    # Fallback: generic overlap minus system PIDs
+                    # (hook_set already excludes them)
+                    overlap = hook_set.intersection(session.ancestor_pids)
+                    if not overlap:
                         logger.debug(
-                            "  MATCH %s (%s): ancestor overlap (fallback) %s",
+                            "  SKIP %s (%s): no ancestor overlap",
                             session.session_id,
                             session.client_name,
-                            overlap,
                         )
-                elif client_name is not None and session.client_name is not None:
-                    # Fallback: match by client name if no ancestor PIDs
-                    if client_name.lower() not in session.client_name.lower():
                         continue
+                    logger.debug(
+                        "  MATCH %s (%s): ancestor overlap (fallback) %s",
+                        session.session_id,
+                        session.client_name,
+                        overlap,
+                    )
+            elif client_needle is not None and session.client_name is not None:
+                # Fallback: match by client name if no ancestor PIDs
+                if client_needle not in session._client_name_lower:
+                    continue
 
-                matches.append(session)
-            return matches
+            matches.append(session)
+        return matches
@@ -1,5 +1,6 @@
 """Tests for session_store module."""
 
+import threading
 import time
 
 from lineage_tray.session_store import SessionInfo, SessionStore, infer_client_from_ancestors
@@ -39,6 +40,27 @@ class TestSessionInfo:
         )
         assert "PID 1234" in s.display_name
 
+    def test_display_name_refreshes_after_update(self):
+        store = SessionStore()
+        store.register({
+            "session_id": "s1",
+            "pid": 1234,
+            "base_dir": "C:\\proj",
+            "started_at": time.time(),
+        })
+        s = store.get("s1")
+        assert s.display_name == "✅ PID 1234"
+        store.update("s1", {"client_name": "VS Code", "last_tool": "read: a.py"})
+        assert s.display_name == "✅ VS Code read: a.py"
+        store.update("s1", {"interrupted": True})
+        assert s.display_name == "⛔ VS Code read: a.py"
+
+    def test_started_at_ns_follows_started_at(self):
+        s = SessionInfo(session_id="s1", pid=1, base_dir="C:\\proj", started_at=1.5)
+        assert s.started_at_ns == 1_500_000_000
+        s.started_at = 2.0
+        assert s.started_at_ns == 2_000_000_000
+
     def test_since_str(self):
         s = SessionInfo(
             session_id="s1",
@@ -49,6 +71,19 @@ class TestSessionInfo:
         # Should produce something like "02:30 PM"
         assert len(s.since_str) > 0
 
+    def test_since_str_tracks_started_at_changes(self):
+        t = time.mktime((2024, 1, 1, 9, 15, 0, 0, 0, -1))
+        s = SessionInfo(
+            session_id="s1",
+            pid=1234,
+            base_dir="C:\\proj",
+            started_at=t,
+        )
+        assert s.since_str == "09:15 AM"
+        assert s.since_str is s.since_str
+        s.started_at = t + 3600
+        assert s.since_str == "10:15 AM"
+
 
 class TestSessionStore:
     """Tests for SessionStore."""
@@ -116,6 +151,53 @@ class TestSessionStore:
         store = SessionStore()
         store.update("nonexistent", {"files_tracked": 10})  # Should not raise
 
+    def test_register_keyword_fields(self):
+        store = SessionStore()
+        store.register(
+            session_id="s1", pid=1234, base_dir="C:\\proj", started_at=time.time()
+        )
+        store.register({"session_id": "s1", "type": "register"}, client_name="VS Code")
+        assert store.count == 1
+        assert store.get("s1").pid == 1234
+        assert store.get("s1").client_name == "VS Code"
+
+    def test_register_many(self):
+        store = SessionStore()
+        t = time.time()
+        store.register_many([
+            {"session_id": "s1", "pid": 1, "base_dir": "C:\\proj", "started_at": t},
+            {"session_id": "s2", "pid": 2, "base_dir": "C:\\proj", "started_at": t},
+            {"session_id": "s1", "pid": 1, "base_dir": "C:\\proj", "started_at": t,
+             "client_name": "VS Code"},
+        ])
+        assert store.count == 2
+        assert store.get("s1").client_name == "VS Code"
+
+    def test_update_many(self):
+        store = SessionStore()
+        t = time.time()
+        store.register_many([
+            {"session_id": "s1", "pid": 1, "base_dir": "C:\\proj", "started_at": t},
+            {"session_id": "s2", "pid": 2, "base_dir": "C:\\proj", "started_at": t},
+        ])
+        store.update_many([
+            ("s1", {"files_tracked": 3}),
+            ("missing", {"files_tracked": 9}),
+            ("s2", {"files_tracked": 5}),
+        ])
+        assert store.get("s1").files_tracked == 3
+        assert store.get("s2").files_tracked == 5
+        assert store.count == 2
+
+    def test_base_dir_interned(self):
+        store = SessionStore()
+        t = time.time()
+        store.register({"session_id": "s1", "pid": 1, "started_at": t,
+                        "base_dir": "".join(["C:\\", "proj"])})
+        store.register({"session_id": "s2", "pid": 2, "started_at": t,
+                        "base_dir": "".join(["C:\\", "proj"])})
+        assert store.get("s1").base_dir is store.get("s2").base_dir
+
     def test_get_grouped_empty(self):
         store = SessionStore()
         groups = store.get_grouped()
@@ -154,6 +236,39 @@ class TestSessionStore:
         assert groups["C:\\proj1"][0].pid == 1234
         assert groups["C:\\proj1"][1].pid == 5678
 
+    def test_get_grouped_sorted_regardless_of_register_order(self):
+        store = SessionStore()
+        t = time.time()
+        for sid, pid, offset in (("s1", 1, 2), ("s2", 2, 0), ("s3", 3, 1)):
+            store.register({
+                "session_id": sid,
+                "pid": pid,
+                "base_dir": "C:\\proj1",
+                "started_at": t + offset,
+            })
+        assert [s.pid for s in store.get_grouped()["C:\\proj1"]] == [2, 3, 1]
+
+    def test_get_grouped_after_unregister_and_move(self):
+        store = SessionStore()
+        t = time.time()
+        store.register({"session_id": "s1", "pid": 1, "base_dir": "C:\\a", "started_at": t})
+        store.register({"session_id": "s2", "pid": 2, "base_dir": "C:\\a", "started_at": t + 1})
+        store.unregister("s1")
+        store.register({"session_id": "s2", "pid": 2, "base_dir": "C:\\b", "started_at": t + 1})
+        groups = store.get_grouped()
+        assert list(groups) == ["C:\\b"]
+        assert groups["C:\\b"][0].pid == 2
+
+    def test_get_grouped_reused_until_membership_changes(self):
+        store = SessionStore()
+        store.register({"session_id": "s1", "pid": 1, "base_dir": "C:\\proj", "started_at": time.time()})
+        groups = store.get_grouped()
+        store.update("s1", {"files_tracked": 4})
+        assert store.get_grouped() is groups
+        store.unregister("s1")
+        assert store.get_grouped() is not groups
+        assert len(store.get_grouped()) == 0
+
     def test_get_grouped_multiple_dirs(self):
         store = SessionStore()
         store.register({
@@ -191,6 +306,41 @@ class TestSessionStore:
         })
         assert store.count == 2
 
+    def test_reads_do_not_block_on_writer_lock(self):
+        store = SessionStore()
+        store.register({
+            "session_id": "s1",
+            "pid": 1234,
+            "base_dir": "C:\\proj",
+            "started_at": time.time(),
+        })
+        results = []
+
+        def reader():
+            results.append((
+                store.count,
+                store.get("s1").pid,
+                len(store.get_grouped()["C:\\proj"]),
+                len(store.find_by_filter(base_dir="C:\\proj")),
+            ))
+
+        with store._lock:
+            t = threading.Thread(target=reader)
+            t.start()
+            t.join(timeout=2.0)
+        assert not t.is_alive()
+        assert results == [(1, 1234, 1, 1)]
+
+    def test_get_grouped_result_is_independent_of_later_changes(self):
+        store = SessionStore()
+        t = time.time()
+        store.register({"session_id": "s1", "pid": 1, "base_dir": "C:\\proj", "started_at": t})
+        groups = store.get_grouped()
+        store.register({"session_id": "s2", "pid": 2, "base_dir": "C:\\proj", "started_at": t})
+        store.unregister("s1")
+        assert [s.pid for s in groups["C:\\proj"]] == [1]
+        assert [s.pid for s in store.get_grouped()["C:\\proj"]] == [2]
+
 
 class TestFindByFilter:
     """Tests for SessionStore.find_by_filter."""
@@ -534,6 +684,27 @@ class TestAncestorChainStr:
         assert "?(200)" in chain
 
 
+    def test_ancestor_chain_str_refreshes_on_reregister(self):
+        store = SessionStore()
+        store.register({
+            "session_id": "s1",
+            "pid": 100,
+            "base_dir": "C:\\proj",
+            "started_at": time.time(),
+        })
+        s = store.get("s1")
+        assert s.ancestor_chain_str == "PID 100 (no chain)"
+        store.register({
+            "session_id": "s1",
+            "pid": 100,
+            "base_dir": "C:\\proj",
+            "started_at": time.time(),
+            "ancestor_pids": [100, 200],
+            "ancestor_names": ["python.exe", "Code.exe"],
+        })
+        assert s.ancestor_chain_str == "python.exe(100) → Code.exe(200)"
+
+
 class TestInferClientFromAncestors:
     """Tests for infer_client_from_ancestors function."""
 
@@ -4,23 +4,40 @@ A Model Context Protocol server for file operations with change detection
 and instruction file discovery.
 """
 
-import sys
-from typing import Dict, List
+import asyncio
+import functools
+import importlib
+import re
+import threading
+import weakref
+from typing import Awaitable, Callable, Dict, List
 
 from mcp.server.fastmcp import Context, FastMCP
 
 from config import ALLOW_FULL_PATHS, DEBUG_CLIENT_INFO, INTERRUPT_MESSAGE, get_read_char_limit, get_response_footer
 from path_utils import init_base_dir_from_args, set_allow_full_paths
 from session_state import session
-from tools import (
-    clear_cache,
-    delete_file,
-    list_files,
-    modify as modify_impl,
-    read_file,
-    search_files,
-)
-from tray_client import init_tray_client, log_tool_call
+
+
+def _lazy_tool(name: str) -> Callable[..., Awaitable[str]]:
+    """Return a stand-in for tools.<name>.<name> that imports it on first call.
+
+    The tools package (and what its modules pull in) is only loaded once a
+    tool is actually called, not when the server starts.
+    """
+    async def call(*args, **kwargs) -> str:
+        return await getattr(importlib.import_module(f"tools.{name}"), name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    return call
+
+
+clear_cache = _lazy_tool("clear_cache")
+delete_file = _lazy_tool("delete_file")
+list_files = _lazy_tool("list_files")
+modify_impl = _lazy_tool("modify")
+read_file = _lazy_tool("read_file")
+search_files = _lazy_tool("search_files")
 
 # Initialize base directory from command line argument
 init_base_dir_from_args()
@@ -28,15 +45,64 @@ init_base_dir_from_args()
 # Apply allowFullPaths setting from config
 set_allow_full_paths(ALLOW_FULL_PATHS)
 
+# tray_client module, set once the background tray connection is initialized
+_tray = None
+
+
+def _init_tray() -> None:
+    """Import tray_client and connect to the system tray.
+
+    Launching the tray can wait up to a couple of seconds for it to come up,
+    so this runs on a daemon thread instead of delaying server startup.
+    """
+    global _tray
+    try:
+        import tray_client
+        from path_utils import get_base_dir
+
+        tray_client.init_tray_client(str(get_base_dir()))
+        _tray = tray_client
+    except Exception:
+        pass  # Tray is optional - never fail the server
+
+
 # Try to connect to the system tray (optional, non-blocking)
-try:
-    from path_utils import get_base_dir
-    init_tray_client(str(get_base_dir()))
-except Exception:
-    pass  # Tray is optional - never fail the server
+threading.Thread(target=_init_tray, name="lineage-tray-init", daemon=True).start()
+
+class _LineageMCP(FastMCP):
+    """FastMCP with a memoized tools/list response.
+
+    FastMCP builds each tool's input schema once at registration, but still
+    rebuilds the full list of MCP Tool models on every tools/list request.
+    The tool set is fixed once this module finishes importing, so build the
+    list once and reuse it until another tool is registered.
+    """
+
+    _tools_cache: list | None = None
+
+    def add_tool(self, *args, **kwargs) -> None:
+        self._tools_cache = None
+        super().add_tool(*args, **kwargs)
+
+    async def list_tools(self) -> list:
+        if self._tools_cache is None:
+            self._tools_cache = await super().list_tools()
+        return self._tools_cache
+
+
+# Shared guidance for every tool. Sent once as the server instructions in the
+# initialize response rather than repeated in each tool description, which
+# clients resend to the model on every turn.
+_SERVER_INSTRUCTIONS = (
+    'If a lineage tool returns a "[SYSTEM] MCP Tool Interrupt Active" message, you MUST stop '
+    "all operations immediately and use ask_user() before proceeding."
+)
 
 # Create MCP server instance
-mcp = FastMCP("lineage")
+mcp = _LineageMCP("lineage", instructions=_SERVER_INSTRUCTIONS)
+
+
+_INT_STRING = re.compile(r"[+-]?[0-9]+")
 
 
 def _coerce_optional_int(name: str, value: int | str | None) -> int | None:
@@ -44,21 +110,18 @@ def _coerce_optional_int(name: str, value: int | str | None) -> int | None:
 
     Empty strings are treated as omitted values so clients that serialize
     optional fields as blank strings do not trip validation before the real
-    tool logic runs.
+    tool logic runs. Other strings must be plain ASCII integers; anything
+    else is rejected before any file I/O happens.
     """
-    if value is None:
-        return None
+    if value is None or isinstance(value, int):
+        return value
     if isinstance(value, str):
-        stripped = value.strip()
-        if stripped == "":
+        value = value.strip()
+        if value == "":
             return None
-        value = stripped
-    if isinstance(value, int):
-        return value
-    try:
-        return int(value)
-    except (ValueError, TypeError) as exc:
-        raise ValueError(f"'{name}' must be an integer, got: {value!r}") from exc
+        if _INT_STRING.fullmatch(value):
+            return int(value)
+    raise ValueError(f"'{name}' must be an integer, got: {value!r}")
 
 
 def _normalize_read_pagination_args(
@@ -88,39 +151,88 @@ def _normalize_read_pagination_args(
 
     return offset, limit, cursor
 
+# Client names by MCP server session. clientInfo is fixed once a session has
+# initialized, so each session only needs the attribute walk once.
+_client_names: "weakref.WeakKeyDictionary[object, str]" = weakref.WeakKeyDictionary()
+
+
 def _get_client_name(ctx: Context | None) -> str | None:
     """Extract the MCP client name from the Context, if available."""
     try:
-        if ctx and ctx.session and ctx.session.client_params:
-            return ctx.session.client_params.clientInfo.name
-    except (AttributeError, TypeError):
-        pass
-    return None
+        server_session = ctx.session if ctx else None
+        if not server_session:
+            return None
+        try:
+            return _client_names[server_session]
+        except (KeyError, TypeError):
+            pass
+        client_params = server_session.client_params
+        if not client_params:
+            return None
+        name = client_params.clientInfo.name
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if name:
+        try:
+            _client_names[server_session] = name
+        except TypeError:
+            pass  # Session type does not support weak references
+    return name
 
 def _append_footer(result: str, client_name: str | None = None) -> str:
     """Append the configured responseFooter to a tool result, if non-empty."""
     footer = get_response_footer(client_name)
     if not footer:
         return result
-    return result + "\n\n---\n" + footer
+    return f"{result}\n\n---\n{footer}"
 
 
-def _check_interrupted() -> str | None:
-    """Check if the session is in interrupted mode.
+def _lineage_tool(name: str) -> Callable:
+    """Wrap a tool body with the shared interrupt check, footer, and tray log.
 
-    When interrupted, tools must return ONLY the interrupt message and
-    perform NO other operations. The interrupted state persists until
-    the user clicks Resume in the system tray.
+    The wrapped function only returns its raw result. Interrupted calls
+    return the interrupt message without running the body. Every call,
+    including interrupted or failing ones, is logged to the tray after it
+    finishes. The interrupt instructions live in the server instructions,
+    not in each tool description.
 
-    Returns:
-        The configured interrupt message if interrupted, None otherwise.
+    Args:
+        name: Tool name reported to the tray.
     """
-    if session.check_interrupted():
-        return INTERRUPT_MESSAGE
-    return None
-
-# Register tools with MCP server
-@mcp.tool()
+    def decorator(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+        param_names = fn.__code__.co_varnames[:fn.__code__.co_argcount]
+
+        @functools.wraps(fn)
+        async def wrapper(*args, ctx: Context = None, **kwargs) -> str:
+            try:
+                # When interrupted, return ONLY the interrupt message and do no
+                # other work until the user clicks Resume in the system tray.
+                # A plain attribute read keeps the common, not-interrupted path cheap.
+                if session.interrupted:
+                    return INTERRUPT_MESSAGE
+                result = await fn(*args, ctx=ctx, **kwargs)
+                return _append_footer(result, _get_client_name(ctx))
+            finally:
+                tray = _tray
+                if tray is not None and tray.tray_available():
+                    # FastMCP passes tool arguments by keyword, so only direct calls
+                    # pay for mapping positional arguments back to their names.
+                    if args:
+                        kwargs = {**dict(zip(param_names, args)), **kwargs}
+                    tray.log_tool_call_nowait(name, ctx=ctx, files_tracked=session.files_tracked, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# Tools return str rather than raw file bytes. Results travel inside JSON-RPC
+# messages, where text is JSON-escaped into the message body, so the stdio
+# writer cannot pass file bytes through verbatim; returning bytes would only
+# move the decode step into FastMCP.
+
+# Tool bodies; registered with the MCP server from _TOOLS below
+@_lineage_tool("list")
 async def list(path: str = "", ctx: Context = None) -> str:
     """List all files in the specified directory.
 
@@ -129,17 +241,10 @@ async def list(path: str = "", ctx: Context = None) -> str:
 
     Returns:
         Markdown formatted table of files/directories with metadata and changed files section.
-        If you receive a "[SYSTEM] MCP Tool Interrupt Active" message, you MUST stop all
-        operations immediately and use ask_user() before proceeding.
     """
-    log_tool_call("list", ctx=ctx, path=path)
-    interrupted = _check_interrupted()
-    if interrupted:
-        return interrupted
-    result = await list_files(path)
-    return _append_footer(result, _get_client_name(ctx))
+    return await list_files(path)
 
-@mcp.tool()
+@_lineage_tool("search")
 async def search(pattern: str, path: str = "", ctx: Context = None) -> str:
     """Search for files matching a glob pattern.
 
@@ -153,17 +258,10 @@ async def search(pattern: str, path: str = "", ctx: Context = None) -> str:
 
     Returns:
         List of matching file paths, or error message if pattern is invalid.
-        If you receive a "[SYSTEM] MCP Tool Interrupt Active" message, you MUST stop all
-        operations immediately and use ask_user() before proceeding.
     """
-    log_tool_call("search", ctx=ctx, pattern=pattern, path=path)
-    interrupted = _check_interrupted()
-    if interrupted:
-        return interrupted
-    result = await search_files(pattern, path)
-    return _append_footer(result, _get_client_name(ctx))
+    return await search_files(pattern, path)
 
-@mcp.tool()
+@_lineage_tool("read")
 async def read(
     file_path: str,
     show_line_numbers: bool = False,
@@ -204,20 +302,12 @@ async def read(
         For paginated reads: includes progress info, line range, reads remaining,
         and continuation instructions with the next cursor value.
         [CHANGED_FILES] and [AGENTS.MD] sections appended as usual.
-        If you receive a "[SYSTEM] MCP Tool Interrupt Active" message, you MUST stop all
-        operations immediately and use ask_user() before proceeding.
     """
     offset = _coerce_optional_int("offset", offset)
     limit = _coerce_optional_int("limit", limit)
     cursor = _coerce_optional_int("cursor", cursor)
     offset, limit, cursor = _normalize_read_pagination_args(offset, limit, cursor)
 
-    log_tool_call("read", ctx=ctx, file_path=file_path,
-                  show_line_numbers=show_line_numbers,
-                  offset=offset, limit=limit, cursor=cursor)
-    interrupted = _check_interrupted()
-    if interrupted:
-        return interrupted
     client_name = _get_client_name(ctx)
     char_limit = get_read_char_limit(client_name)
 
@@ -227,11 +317,11 @@ async def read(
 
     if DEBUG_CLIENT_INFO:
         debug_prefix = f"[Client: {client_name or 'unknown'} | readCharLimit: {char_limit}]\n"
-        result = debug_prefix + result
+        result = f"{debug_prefix}{result}"
 
-    return _append_footer(result, client_name)
+    return result
 
-@mcp.tool()
+@_lineage_tool("modify")
 async def modify(
     operations: List[Dict],
     on_error: str = "abort",
@@ -263,18 +353,11 @@ async def modify(
 
     Returns:
         Per-operation success or error results.
-        If you receive a "[SYSTEM] MCP Tool Interrupt Active" message, you MUST stop all
-        operations immediately and use ask_user() before proceeding.
     """
-    log_tool_call("modify", ctx=ctx, operations=operations, on_error=on_error)
-    interrupted = _check_interrupted()
-    if interrupted:
-        return interrupted
-    result = await modify_impl(operations, on_error)
-    return _append_footer(result, _get_client_name(ctx))
+    return await modify_impl(operations, on_error)
 
 
-@mcp.tool()
+@_lineage_tool("delete")
 async def delete(file_path: str, ctx: Context = None) -> str:
     """Delete a file or empty directory.
 
@@ -283,18 +366,46 @@ async def delete(file_path: str, ctx: Context = None) -> str:
 
     Returns:
         Success or error message.
-        If you receive a "[SYSTEM] MCP Tool Interrupt Active" message, you MUST stop all
-        operations immediately and use ask_user() before proceeding.
     """
-    log_tool_call("delete", ctx=ctx, file_path=file_path)
-    interrupted = _check_interrupted()
-    if interrupted:
-        return interrupted
-    result = await delete_file(file_path)
-    return _append_footer(result, _get_client_name(ctx))
+    return await delete_file(file_path)
+
+
+# Tool bodies reachable from batch(), without their per-call wrapper
+_BATCH_TOOLS = {tool.__name__: tool.__wrapped__ for tool in (list, search, read, modify, delete)}
+
+
+@_lineage_tool("batch")
+async def batch(calls: List[Dict], ctx: Context = None) -> str:
+    """Run several tool calls in a single request.
+
+    Use this to save round-trips when you already know the next few calls, such as
+    reading several files at once. Calls run one after another in the order provided,
+    so later calls see the results of earlier ones (e.g. a read after a modify).
+    A failing call does not stop the calls after it.
+
+    Args:
+        calls: Ordered list of tool calls. Each call must include:
+            - tool (str): One of 'list', 'search', 'read', 'modify', or 'delete'
+            - args (dict, optional): Arguments for that tool, as for a direct call
+
+    Returns:
+        Each call's result under a numbered [N] tool heading.
+    """
+    sections: List[str] = []
+    for index, call in enumerate(calls, start=1):
+        tool_name = call.get("tool") if isinstance(call, dict) else None
+        body = _BATCH_TOOLS.get(tool_name)
+        if body is None:
+            result = f"Error: Unknown tool: {tool_name!r}. Use one of: {', '.join(_BATCH_TOOLS)}"
+        else:
+            try:
+                result = await body(ctx=ctx, **(call.get("args") or {}))
+            except (TypeError, ValueError) as exc:
+                result = f"Error: Invalid arguments for {tool_name}: {exc}"
+        sections.append(f"[{index}] {tool_name}\n{result}")
+    return "\n\n".join(sections)
 
 
-@mcp.tool()
 async def clear(ctx: Context = None) -> str:
     """Clear all session caches.
 
@@ -308,8 +419,32 @@ async def clear(ctx: Context = None) -> str:
         Success message confirming cache was cleared
     """
     result = await clear_cache()
+    if _tray is not None and _tray.tray_available():
+        _tray.log_tool_call_nowait("clear", ctx=ctx, files_tracked=session.files_tracked)
     return _append_footer(result, _get_client_name(ctx))
 
+
+# Register tools with MCP server, in the order clients list them
+_TOOLS = (list, search, read, modify, delete, batch, clear)
+
+for _tool in _TOOLS:
+    mcp.add_tool(_tool, structured_output=False)
+
+
+def _use_uvloop() -> bool:
+    """Run the server on uvloop when it is installed (optional, not on Windows).
+
+    Returns:
+        True if the uvloop event loop policy was installed, False otherwise.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 def main():
     """Entry point for CLI: lineage-mcp /path/to/base/dir
 
@@ -317,6 +452,7 @@ def main():
     after installing the package via pip. The base directory is already
     initialized from command-line arguments at module import time.
     """
+    _use_uvloop()
     mcp.run()
 
 if __name__ == "__main__":
@@ -3,13 +3,15 @@
 Provides secure path resolution and validation using pathlib.
 """
 
+import functools
+import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Union
+from typing import Collection, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class PathResult:
     """Result of a path resolution operation.
 
@@ -92,6 +94,17 @@ def init_base_dir_from_args() -> Path:
     return _base_dir
 
 
+@functools.lru_cache(maxsize=4)
+def _base_dir_prefix(base_dir: Path) -> tuple[str, str]:
+    """Return the base directory string and that string with a trailing separator.
+
+    Keyed on the Path itself so it stays correct even when _base_dir is
+    reassigned directly (as the tests do).
+    """
+    base_str = str(base_dir)
+    return base_str, base_str if base_str.endswith(os.sep) else base_str + os.sep
+
+
 def resolve_path(relative_path: str) -> PathResult:
     """Resolve a relative path to absolute, validating security.
 
@@ -108,14 +121,26 @@ def resolve_path(relative_path: str) -> PathResult:
     Returns:
         PathResult with either the resolved path or an error message.
     """
+    # The base directory itself (list/search default): already resolved by
+    # set_base_dir and inside the base by definition. Other paths always go
+    # through realpath, since a symlink anywhere below the base can point out.
+    if relative_path in ("", "."):
+        return PathResult.ok(_base_dir)
+
     try:
-        # Resolve to absolute path
-        target = (_base_dir / relative_path).resolve()
+        # Resolve to absolute path on every call: a cached result would go
+        # stale if a path component is later replaced by a symlink.
+        # realpath on strings skips the intermediate PurePath objects
+        # Path.resolve builds along the way.
+        target = Path(os.path.realpath(os.path.join(_base_dir, relative_path)))
 
         # Security check: ensure path is within base directory
         # Skip if allowFullPaths is enabled
+        # (compare against "base + separator" so /data2 does not pass for /data)
         if not _allow_full_paths:
-            if not str(target).startswith(str(_base_dir)):
+            base_str, base_prefix = _base_dir_prefix(_base_dir)
+            target_str = str(target)
+            if target_str != base_str and not target_str.startswith(base_prefix):
                 return PathResult.err(f"Error: Cannot access files outside of the base directory. (base directory: {_base_dir})")
 
         return PathResult.ok(target)
@@ -123,11 +148,11 @@ def resolve_path(relative_path: str) -> PathResult:
         return PathResult.err(f"Error: Invalid path: {e}")
 
 
-def get_file_mtime_ms(file_path: Path) -> int:
+def get_file_mtime_ms(file_path: Union[str, Path]) -> int:
     """Get file modification time in milliseconds.
 
     Args:
-        file_path: Absolute path to the file.
+        file_path: Absolute path to the file, as a Path or a plain string.
 
     Returns:
         Modification time in milliseconds as integer.
@@ -135,15 +160,33 @@ def get_file_mtime_ms(file_path: Path) -> int:
     Raises:
         OSError: If file cannot be stat'ed.
     """
-    return int(file_path.stat().st_mtime_ns / 1_000_000)
+    return os.stat(os.fspath(file_path)).st_mtime_ns // 1_000_000
+
+
+def stat_mtime_ms(stat_result: os.stat_result) -> int:
+    """Get the modification time in milliseconds from an existing stat result.
+
+    Lets callers that already hold a stat (e.g. from os.fstat on an open
+    file) skip a second stat call.
+
+    Args:
+        stat_result: Result of os.stat, os.fstat, or Path.stat.
+
+    Returns:
+        Modification time in milliseconds as integer.
+    """
+    # Integer division keeps full precision; st_mtime_ns / 1e6 goes through
+    # a float and can be off by a millisecond for current timestamps.
+    return stat_result.st_mtime_ns // 1_000_000
 
 
-def is_instruction_file(file_path: Path, instruction_file_names: list[str]) -> bool:
+def is_instruction_file(file_path: Path, instruction_file_names: Collection[str]) -> bool:
     """Check if a file is an instruction file.
 
     Args:
         file_path: Path to the file.
-        instruction_file_names: List of valid instruction file names.
+        instruction_file_names: Valid instruction file names. Pass a set
+            (e.g. config.INSTRUCTION_FILE_NAME_SET) for O(1) membership.
 
     Returns:
         True if the file name matches an instruction file name.
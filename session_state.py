@@ -4,37 +4,87 @@ Provides a centralized dataclass for managing all session state,
 eliminating scattered global variables.
 """
 
+import hashlib
+import sys
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 
-from config import load_new_session_cooldown_seconds
+from config import load_max_cached_contents, load_new_session_cooldown_seconds
 
 # Load cooldown at module import
 _NEW_SESSION_COOLDOWN_SECONDS: float = load_new_session_cooldown_seconds()
+_MAX_CACHED_CONTENTS: int = load_max_cached_contents()
 
 
-@dataclass
+def content_digest(content: str) -> bytes:
+    """Return a 16-byte BLAKE2b digest of file content for change detection.
+
+    Args:
+        content: Full file content.
+
+    Returns:
+        The digest bytes.
+    """
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+@dataclass(slots=True)
 class SessionState:
     """Holds all session-scoped caches that persist until server restart.
 
     All caches are cleared together on cache clear (via tray/compaction) or server restart.
 
+    Path keys are interned when they are stored, so the same path string is
+    shared across caches and repeat lookups can match on identity before
+    comparing characters. Lookups use the caller's string as-is, so probing
+    for an untracked path does not add it to the intern table. Callers
+    hitting these methods in a tight loop can pre-intern.
+
     Attributes:
         mtimes: Maps absolute file paths to their last-seen modification times (ms).
-        contents: Maps absolute file paths to their last-seen content for diffing.
+        contents: Maps absolute file paths to their last-seen content for diffing,
+            least recently used first. Bounded by maxCachedContents; evicted
+            files stay tracked through mtimes and content_hashes.
+        content_hashes: Maps absolute file paths to a digest of their last-seen
+            content, for files whose content has been evicted from contents.
+            Files still in contents are compared on the text itself.
+        sizes: Maps absolute file paths to their last-seen size in bytes, when known.
         appended_instruction_folders: Set of folder paths whose instruction file
             content has already been appended in this session.
         last_new_session_time: Monotonic timestamp of the last cooldown-protected clear.
     """
 
     mtimes: Dict[str, int] = field(default_factory=dict)
-    contents: Dict[str, str] = field(default_factory=dict)
+    contents: OrderedDict[str, str] = field(default_factory=OrderedDict)
+    content_hashes: Dict[str, bytes] = field(default_factory=dict)
+    sizes: Dict[str, int] = field(default_factory=dict)
     appended_instruction_folders: set[str] = field(default_factory=set)
     last_new_session_time: Optional[float] = field(default=None)
     new_session_clear_count: int = field(default=0)
     interrupted: bool = field(default=False)
     pending_overhead: Dict[str, str] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def _within_cooldown(self, now: float) -> bool:
+        """Check whether a cooldown-protected clear happened too recently."""
+        last = self.last_new_session_time
+        return last is not None and (now - last) < _NEW_SESSION_COOLDOWN_SECONDS
+
+    def _reset_caches(self) -> None:
+        """Swap every per-file cache for a fresh empty container.
+
+        Rebinding drops each old container as a whole instead of clearing it
+        entry by entry; nothing outside this class keeps a reference to them.
+        """
+        self.mtimes = {}
+        self.contents = OrderedDict()
+        self.content_hashes = {}
+        self.sizes = {}
+        self.appended_instruction_folders = set()
+        self.pending_overhead = {}
 
     def clear(self) -> None:
         """Clear all session caches unconditionally.
@@ -44,12 +94,10 @@ class SessionState:
         Increments clear count (never reset) so base instruction files
         are included after the first compaction.
         """
-        self.mtimes.clear()
-        self.contents.clear()
-        self.appended_instruction_folders.clear()
-        self.last_new_session_time = None
-        self.new_session_clear_count += 1
-        self.pending_overhead.clear()
+        with self._lock:
+            self._reset_caches()
+            self.last_new_session_time = None
+            self.new_session_clear_count += 1
 
     def try_new_session(self) -> bool:
         """Attempt to clear caches with cooldown protection.
@@ -58,35 +106,98 @@ class SessionState:
         the request is silently ignored to avoid redundant clears
         during the initial burst of tool calls.
 
+        The tray listener thread calls this while tools run on the event
+        loop, so the check-and-clear happens under a lock; the common
+        "within cooldown" case is answered before taking it.
+
         Returns:
             True if caches were actually cleared, False if suppressed by cooldown.
         """
         now = time.monotonic()
 
-        if (
-            self.last_new_session_time is not None
-            and (now - self.last_new_session_time) < _NEW_SESSION_COOLDOWN_SECONDS
-        ):
+        if self._within_cooldown(now):
             return False
 
-        self.mtimes.clear()
-        self.contents.clear()
-        self.appended_instruction_folders.clear()
-        self.last_new_session_time = now
-        self.new_session_clear_count += 1
-        self.pending_overhead.clear()
+        with self._lock:
+            # Another caller may have cleared while we waited for the lock
+            if self._within_cooldown(now):
+                return False
+
+            self._reset_caches()
+            self.last_new_session_time = now
+            self.new_session_clear_count += 1
         return True
 
-    def track_file(self, file_path: str, mtime_ms: int, content: str) -> None:
+    def track_file(self, file_path: str, mtime_ms: int, content: str, size: Optional[int] = None) -> None:
         """Track a file's state for change detection.
 
         Args:
             file_path: Absolute path to the file.
             mtime_ms: Modification time in milliseconds.
             content: Full file content.
+            size: File size in bytes from the same stat as mtime_ms, if available.
         """
+        file_path = sys.intern(file_path)
         self.mtimes[file_path] = mtime_ms
-        self.contents[file_path] = content
+        self.remember_content(file_path, content)
+        if size is None:
+            self.sizes.pop(file_path, None)
+        else:
+            self.sizes[file_path] = size
+
+    def remember_content(self, file_path: str, content: str) -> None:
+        """Cache a file's content for diffing, evicting the least recently used.
+
+        Content is only hashed when it is evicted, so tracking a file (done
+        on every read and write) does not encode and hash its full text.
+
+        Args:
+            file_path: Absolute path to the file.
+            content: Full file content.
+        """
+        contents = self.contents
+        contents[file_path] = content
+        contents.move_to_end(file_path)
+        self.content_hashes.pop(file_path, None)
+        if len(contents) > _MAX_CACHED_CONTENTS:
+            evicted_path, evicted_content = contents.popitem(last=False)
+            self.content_hashes[evicted_path] = content_digest(evicted_content)
+
+    def has_same_content(self, file_path: str, content: str) -> bool:
+        """Check whether content matches the last-seen content of a tracked file.
+
+        Args:
+            file_path: Absolute path to the file.
+            content: Current file content.
+
+        Returns:
+            True if the cached text (or, once evicted, its digest) matches.
+        """
+        cached = self.contents.get(file_path)
+        if cached is not None:
+            return cached == content
+        digest = self.content_hashes.get(file_path)
+        return digest is not None and digest == content_digest(content)
+
+    def is_unchanged(self, file_path: str, mtime_ms: int, size: int) -> bool:
+        """Check a fresh stat against the tracked (mtime, size) pair.
+
+        A file whose size was not recorded is compared on mtime alone.
+
+        Args:
+            file_path: Absolute path to the file.
+            mtime_ms: Current modification time in milliseconds.
+            size: Current file size in bytes.
+
+        Returns:
+            True if the file is tracked and neither value has changed.
+        """
+        return self.mtimes.get(file_path) == mtime_ms and self.sizes.get(file_path, size) == size
+
+    @property
+    def files_tracked(self) -> int:
+        """Number of files currently tracked for change detection."""
+        return len(self.mtimes)
 
     def untrack_file(self, file_path: str) -> None:
         """Remove a file from tracking (e.g., after deletion).
@@ -96,6 +207,8 @@ class SessionState:
         """
         self.mtimes.pop(file_path, None)
         self.contents.pop(file_path, None)
+        self.content_hashes.pop(file_path, None)
+        self.sizes.pop(file_path, None)
 
     def mark_instruction_content_appended(self, folder_path: str) -> None:
         """Mark a folder as having its instruction content appended.
@@ -103,7 +216,7 @@ class SessionState:
         Args:
             folder_path: Absolute path to the folder.
         """
-        self.appended_instruction_folders.add(folder_path)
+        self.appended_instruction_folders.add(sys.intern(folder_path))
 
     def has_appended_instruction_content(self, folder_path: str) -> bool:
         """Check if a folder's instruction content has already been appended.
@@ -149,5 +262,11 @@ class SessionState:
         self.interrupted = False
 
 
-# Singleton session state instance
+# Singleton session state instance.
+#
+# This is deliberately one shared object rather than a per-request
+# ContextVar: change detection only works if a file tracked by one tool call
+# is seen by the next, whichever request or task makes it. Tool bodies touch
+# it from the event loop thread, and the tray listener thread via
+# try_new_session/clear, which hold the session lock.
 session = SessionState()
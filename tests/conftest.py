@@ -19,6 +19,17 @@ if _parent_dir not in sys.path:
 # Import test utilities after path setup
 from tests.test_utils import TempWorkspace  # noqa: E402
 
+# Load the server modules up front so import time lands in collection, not
+# in whichever test happens to import them first (keeps --durations honest).
+# lineage itself is left out: importing it applies appsettings to path_utils.
+import file_watcher  # noqa: E402, F401
+import instruction_files  # noqa: E402, F401
+import path_utils  # noqa: E402, F401
+import session_state  # noqa: E402, F401
+import tools.list_files  # noqa: E402, F401
+import tools.modify  # noqa: E402, F401
+import tools.read_file  # noqa: E402, F401
+
 
 @pytest.fixture
 def temp_workspace() -> Generator[TempWorkspace, None, None]:
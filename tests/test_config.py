@@ -4,235 +4,225 @@ Tests configuration loading from appsettings.json including
 valid config, missing config, and error handling.
 """
 
+import codecs
 import json
-import sys
 import unittest
-from pathlib import Path
+from unittest.mock import patch
+
+import config
+from config import (
+    DEFAULT_MAX_CACHED_CONTENTS,
+    load_allow_full_paths,
+    load_client_overrides,
+    load_debug_client_info,
+    load_instruction_file_names,
+    load_max_cached_contents,
+)
+from tests.test_utils import TempWorkspace
 
-# Add parent directory to path for module imports
-_parent_dir = str(Path(__file__).parent.parent)
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
 
-from tests.test_utils import TempWorkspace
+class _ConfigDirTestCase(unittest.TestCase):
+    """Shares one temporary workspace per class; each test gets its own subdirectory."""
+
+    _ws: TempWorkspace
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._ws = TempWorkspace().__enter__()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._ws.__exit__(None, None, None)
 
+    def setUp(self) -> None:
+        self.config_dir = self._ws.path / self._testMethodName
+        self.config_dir.mkdir()
 
-class TestConfigurationLoading(unittest.TestCase):
+
+class TestConfigurationLoading(_ConfigDirTestCase):
     """Tests for loading configuration files."""
 
     def test_load_instruction_file_names_from_valid_config(self) -> None:
         """Verify config is loaded from appsettings.json."""
-        with TempWorkspace() as ws:
-            from config import load_instruction_file_names
-
-            config = {"instructionFileNames": ["CUSTOM.md", "OTHER.md"]}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        config = {"instructionFileNames": ["CUSTOM.md", "OTHER.md"]}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            names = load_instruction_file_names(ws.path)
+        names = load_instruction_file_names(self.config_dir)
 
-            self.assertEqual(names, ["CUSTOM.md", "OTHER.md"])
+        self.assertEqual(names, ["CUSTOM.md", "OTHER.md"])
 
     def test_load_instruction_file_names_defaults_when_missing(self) -> None:
         """Verify default is used when config is missing."""
-        with TempWorkspace() as ws:
-            from config import load_instruction_file_names
+        names = load_instruction_file_names(self.config_dir)
 
-            names = load_instruction_file_names(ws.path)
-
-            self.assertEqual(names, ["AGENTS.md"])
+        self.assertEqual(names, ["AGENTS.md"])
 
     def test_load_instruction_file_names_defaults_on_invalid_json(self) -> None:
         """Verify default is used when config is invalid JSON."""
-        with TempWorkspace() as ws:
-            from config import load_instruction_file_names
-
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text("not valid json {", encoding="utf-8")
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text("not valid json {", encoding="utf-8")
 
-            names = load_instruction_file_names(ws.path)
+        names = load_instruction_file_names(self.config_dir)
 
-            self.assertEqual(names, ["AGENTS.md"])
+        self.assertEqual(names, ["AGENTS.md"])
 
     def test_load_instruction_file_names_defaults_on_missing_key(self) -> None:
         """Verify default when key is missing from valid JSON."""
-        with TempWorkspace() as ws:
-            from config import load_instruction_file_names
+        config = {"otherSetting": "value"}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
+
+        names = load_instruction_file_names(self.config_dir)
+
+        self.assertEqual(names, ["AGENTS.md"])
+
+    def test_load_max_cached_contents(self) -> None:
+        """Verify maxCachedContents is loaded and invalid values fall back."""
+        config_path = self.config_dir / "appsettings.json"
+        self.assertEqual(load_max_cached_contents(self.config_dir), DEFAULT_MAX_CACHED_CONTENTS)
+
+        config_path.write_text(json.dumps({"maxCachedContents": 10}), encoding="utf-8")
+        self.assertEqual(load_max_cached_contents(self.config_dir), 10)
+
+        config_path.write_text(json.dumps({"maxCachedContents": 0}), encoding="utf-8")
+        self.assertEqual(load_max_cached_contents(self.config_dir), DEFAULT_MAX_CACHED_CONTENTS)
+
+        config_path.write_text(json.dumps({"maxCachedContents": True}), encoding="utf-8")
+        self.assertEqual(load_max_cached_contents(self.config_dir), DEFAULT_MAX_CACHED_CONTENTS)
+
+    def test_appsettings_parsed_once_per_file_version(self) -> None:
+        """Verify settings share one parse until the file changes."""
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps({"readCharLimit": 100}), encoding="utf-8")
+
+        with patch.object(config, "_json_loads", wraps=config._json_loads) as loads_mock:
+            self.assertEqual(config.load_read_char_limit(self.config_dir), 100)
+            self.assertEqual(config.load_instruction_file_names(self.config_dir), ["AGENTS.md"])
+            self.assertEqual(loads_mock.call_count, 1)
 
-            config = {"otherSetting": "value"}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+            config_path.write_text(json.dumps({"readCharLimit": 2000}), encoding="utf-8")
+            self.assertEqual(config.load_read_char_limit(self.config_dir), 2000)
+            self.assertEqual(loads_mock.call_count, 2)
 
-            names = load_instruction_file_names(ws.path)
+        config.clear_appsettings_cache()
 
-            self.assertEqual(names, ["AGENTS.md"])
+    def test_appsettings_with_utf8_bom(self) -> None:
+        """Verify a BOM-prefixed appsettings.json parses with either parser."""
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_bytes(codecs.BOM_UTF8 + json.dumps({"readCharLimit": 1234}).encode("utf-8"))
 
+        parsers = {"json": json.loads}
+        try:
+            import orjson
+        except ImportError:
+            pass
+        else:
+            parsers["orjson"] = orjson.loads
+
+        for name, loads in parsers.items():
+            with self.subTest(parser=name), patch.object(config, "_json_loads", loads):
+                config.clear_appsettings_cache()
+                self.assertEqual(config.load_read_char_limit(self.config_dir), 1234)
+
+        config.clear_appsettings_cache()
 
-class TestClientOverrides(unittest.TestCase):
+
+class TestClientOverrides(_ConfigDirTestCase):
     """Tests for per-client configuration overrides."""
 
     def test_load_client_overrides_from_valid_config(self) -> None:
         """Verify clientOverrides are loaded from appsettings.json."""
-        with TempWorkspace() as ws:
-            from config import load_client_overrides
-
-            config = {
-                "clientOverrides": {
-                    "OpenCode": {"readCharLimit": 50000},
-                    "Cursor": {"readCharLimit": 15000},
-                }
+        config = {
+            "clientOverrides": {
+                "OpenCode": {"readCharLimit": 50000},
+                "Cursor": {"readCharLimit": 15000},
             }
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        }
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            overrides = load_client_overrides(ws.path)
+        overrides = load_client_overrides(self.config_dir)
 
-            self.assertEqual(overrides["OpenCode"]["readCharLimit"], 50000)
-            self.assertEqual(overrides["Cursor"]["readCharLimit"], 15000)
+        self.assertEqual(overrides["OpenCode"]["readCharLimit"], 50000)
+        self.assertEqual(overrides["Cursor"]["readCharLimit"], 15000)
 
     def test_load_client_overrides_returns_empty_when_missing(self) -> None:
         """Verify empty dict returned when no clientOverrides key."""
-        with TempWorkspace() as ws:
-            from config import load_client_overrides
-
-            config = {"readCharLimit": 7000}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        config = {"readCharLimit": 7000}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            overrides = load_client_overrides(ws.path)
+        overrides = load_client_overrides(self.config_dir)
 
-            self.assertEqual(overrides, {})
+        self.assertEqual(overrides, {})
 
     def test_load_client_overrides_returns_empty_on_no_file(self) -> None:
         """Verify empty dict returned when no config file."""
-        with TempWorkspace() as ws:
-            from config import load_client_overrides
+        overrides = load_client_overrides(self.config_dir)
 
-            overrides = load_client_overrides(ws.path)
-
-            self.assertEqual(overrides, {})
+        self.assertEqual(overrides, {})
 
     def test_load_client_overrides_returns_empty_on_invalid_json(self) -> None:
         """Verify empty dict on invalid JSON."""
-        with TempWorkspace() as ws:
-            from config import load_client_overrides
-
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text("not valid json", encoding="utf-8")
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text("not valid json", encoding="utf-8")
 
-            overrides = load_client_overrides(ws.path)
+        overrides = load_client_overrides(self.config_dir)
 
-            self.assertEqual(overrides, {})
+        self.assertEqual(overrides, {})
 
     def test_load_client_overrides_returns_empty_on_non_dict(self) -> None:
         """Verify empty dict when clientOverrides is not a dict."""
-        with TempWorkspace() as ws:
-            from config import load_client_overrides
+        config = {"clientOverrides": "not a dict"}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            config = {"clientOverrides": "not a dict"}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        overrides = load_client_overrides(self.config_dir)
 
-            overrides = load_client_overrides(ws.path)
-
-            self.assertEqual(overrides, {})
+        self.assertEqual(overrides, {})
 
 
 class TestGetReadCharLimit(unittest.TestCase):
     """Tests for get_read_char_limit resolution logic."""
 
-    def test_returns_global_default_when_no_client_name(self) -> None:
-        """No client name returns global READ_CHAR_LIMIT."""
-        import config
-
-        result = config.get_read_char_limit(None)
-
-        self.assertEqual(result, config.READ_CHAR_LIMIT)
-
-    def test_returns_global_default_when_client_not_in_overrides(self) -> None:
-        """Unknown client name falls back to global limit."""
-        import config
-
-        old_overrides = config.CLIENT_OVERRIDES
-        config.CLIENT_OVERRIDES = {"OpenCode": {"readCharLimit": 50000}}
-        try:
-            result = config.get_read_char_limit("UnknownClient")
-            self.assertEqual(result, config.READ_CHAR_LIMIT)
-        finally:
-            config.CLIENT_OVERRIDES = old_overrides
-
-    def test_returns_override_when_client_matches(self) -> None:
-        """Client name in overrides returns specific limit."""
-        import config
-
+    def test_override_resolution(self) -> None:
+        """Overrides apply only for a matching client with a positive int limit."""
+        cases = [
+            # (overrides, client_name, expected)
+            ({}, None, config.READ_CHAR_LIMIT),
+            ({}, "", config.READ_CHAR_LIMIT),
+            ({"OpenCode": {"readCharLimit": 50000}}, "UnknownClient", config.READ_CHAR_LIMIT),
+            ({"OpenCode": {"readCharLimit": 50000}}, "OpenCode", 50000),
+            ({"OpenCode": {"otherSetting": True}}, "OpenCode", config.READ_CHAR_LIMIT),
+            ({"OpenCode": {"readCharLimit": "not_an_int"}}, "OpenCode", config.READ_CHAR_LIMIT),
+            ({"OpenCode": {"readCharLimit": 0}}, "OpenCode", config.READ_CHAR_LIMIT),
+            ({"OpenCode": {"readCharLimit": -100}}, "OpenCode", config.READ_CHAR_LIMIT),
+            ({"OpenCode": {"readCharLimit": True}}, "OpenCode", config.READ_CHAR_LIMIT),
+        ]
         old_overrides = config.CLIENT_OVERRIDES
-        config.CLIENT_OVERRIDES = {"OpenCode": {"readCharLimit": 50000}}
         try:
-            result = config.get_read_char_limit("OpenCode")
-            self.assertEqual(result, 50000)
+            for overrides, client_name, expected in cases:
+                with self.subTest(overrides=overrides, client_name=client_name):
+                    config.CLIENT_OVERRIDES = overrides
+                    self.assertEqual(config.get_read_char_limit(client_name), expected)
         finally:
             config.CLIENT_OVERRIDES = old_overrides
 
-    def test_falls_back_when_override_missing_readcharlimit(self) -> None:
-        """Client override without readCharLimit falls back to global."""
-        import config
-
+    def test_rebinding_overrides_refreshes_case_insensitive_index(self) -> None:
+        """A new CLIENT_OVERRIDES dict is picked up by the next lookup."""
         old_overrides = config.CLIENT_OVERRIDES
-        config.CLIENT_OVERRIDES = {"OpenCode": {"otherSetting": True}}
         try:
-            result = config.get_read_char_limit("OpenCode")
-            self.assertEqual(result, config.READ_CHAR_LIMIT)
-        finally:
-            config.CLIENT_OVERRIDES = old_overrides
-
-    def test_falls_back_when_override_has_invalid_value(self) -> None:
-        """Client override with non-int readCharLimit falls back to global."""
-        import config
-
-        old_overrides = config.CLIENT_OVERRIDES
-        config.CLIENT_OVERRIDES = {"OpenCode": {"readCharLimit": "not_an_int"}}
-        try:
-            result = config.get_read_char_limit("OpenCode")
-            self.assertEqual(result, config.READ_CHAR_LIMIT)
-        finally:
-            config.CLIENT_OVERRIDES = old_overrides
-
-    def test_falls_back_when_override_value_is_zero(self) -> None:
-        """Client override with readCharLimit=0 falls back to global."""
-        import config
-
-        old_overrides = config.CLIENT_OVERRIDES
-        config.CLIENT_OVERRIDES = {"OpenCode": {"readCharLimit": 0}}
-        try:
-            result = config.get_read_char_limit("OpenCode")
-            self.assertEqual(result, config.READ_CHAR_LIMIT)
-        finally:
-            config.CLIENT_OVERRIDES = old_overrides
-
-    def test_falls_back_when_override_value_is_negative(self) -> None:
-        """Client override with negative readCharLimit falls back to global."""
-        import config
+            config.CLIENT_OVERRIDES = {"OpenCode": {"readCharLimit": 1000}}
+            self.assertEqual(config.get_read_char_limit("opencode"), 1000)
 
-        old_overrides = config.CLIENT_OVERRIDES
-        config.CLIENT_OVERRIDES = {"OpenCode": {"readCharLimit": -100}}
-        try:
-            result = config.get_read_char_limit("OpenCode")
-            self.assertEqual(result, config.READ_CHAR_LIMIT)
+            config.CLIENT_OVERRIDES = {"OPENCODE": {"readCharLimit": 2000}}
+            self.assertEqual(config.get_read_char_limit("OpenCode"), 2000)
         finally:
             config.CLIENT_OVERRIDES = old_overrides
 
-    def test_empty_string_client_name_returns_global(self) -> None:
-        """Empty string client name returns global default."""
-        import config
-
-        result = config.get_read_char_limit("")
-
-        self.assertEqual(result, config.READ_CHAR_LIMIT)
-
     def test_case_insensitive_client_name_lookup(self) -> None:
         """Client name lookup is case-insensitive."""
-        import config
-
         old_overrides = config.CLIENT_OVERRIDES
         config.CLIENT_OVERRIDES = {"OpenCode": {"readCharLimit": 50000}}
         try:
@@ -244,120 +234,93 @@ class TestGetReadCharLimit(unittest.TestCase):
             config.CLIENT_OVERRIDES = old_overrides
 
 
-class TestDebugClientInfo(unittest.TestCase):
+class TestDebugClientInfo(_ConfigDirTestCase):
     """Tests for the debugClientInfo setting."""
 
     def test_load_debug_client_info_default(self) -> None:
         """Default is False when no config file."""
-        with TempWorkspace() as ws:
-            from config import load_debug_client_info
-
-            result = load_debug_client_info(ws.path)
+        result = load_debug_client_info(self.config_dir)
 
-            self.assertFalse(result)
+        self.assertFalse(result)
 
     def test_load_debug_client_info_true(self) -> None:
         """Returns True when set in config."""
-        with TempWorkspace() as ws:
-            from config import load_debug_client_info
+        config = {"debugClientInfo": True}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            config = {"debugClientInfo": True}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        result = load_debug_client_info(self.config_dir)
 
-            result = load_debug_client_info(ws.path)
-
-            self.assertTrue(result)
+        self.assertTrue(result)
 
     def test_load_debug_client_info_false(self) -> None:
         """Returns False when explicitly set to false."""
-        with TempWorkspace() as ws:
-            from config import load_debug_client_info
-
-            config = {"debugClientInfo": False}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        config = {"debugClientInfo": False}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            result = load_debug_client_info(ws.path)
+        result = load_debug_client_info(self.config_dir)
 
-            self.assertFalse(result)
+        self.assertFalse(result)
 
     def test_load_debug_client_info_ignores_non_bool(self) -> None:
         """Returns default when value is not a boolean."""
-        with TempWorkspace() as ws:
-            from config import load_debug_client_info
+        config = {"debugClientInfo": "yes"}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            config = {"debugClientInfo": "yes"}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        result = load_debug_client_info(self.config_dir)
 
-            result = load_debug_client_info(ws.path)
+        self.assertFalse(result)
 
-            self.assertFalse(result)
 
-
-class TestAllowFullPaths(unittest.TestCase):
+class TestAllowFullPaths(_ConfigDirTestCase):
     """Tests for the allowFullPaths setting."""
 
     def test_load_allow_full_paths_default(self) -> None:
         """Default is False when no config file."""
-        with TempWorkspace() as ws:
-            from config import load_allow_full_paths
-
-            result = load_allow_full_paths(ws.path)
+        result = load_allow_full_paths(self.config_dir)
 
-            self.assertFalse(result)
+        self.assertFalse(result)
 
     def test_load_allow_full_paths_true(self) -> None:
         """Returns True when set in config."""
-        with TempWorkspace() as ws:
-            from config import load_allow_full_paths
+        config = {"allowFullPaths": True}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            config = {"allowFullPaths": True}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        result = load_allow_full_paths(self.config_dir)
 
-            result = load_allow_full_paths(ws.path)
-
-            self.assertTrue(result)
+        self.assertTrue(result)
 
     def test_load_allow_full_paths_false(self) -> None:
         """Returns False when explicitly set to false."""
-        with TempWorkspace() as ws:
-            from config import load_allow_full_paths
-
-            config = {"allowFullPaths": False}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        config = {"allowFullPaths": False}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            result = load_allow_full_paths(ws.path)
+        result = load_allow_full_paths(self.config_dir)
 
-            self.assertFalse(result)
+        self.assertFalse(result)
 
     def test_load_allow_full_paths_ignores_non_bool(self) -> None:
         """Returns default when value is not a boolean."""
-        with TempWorkspace() as ws:
-            from config import load_allow_full_paths
+        config = {"allowFullPaths": "yes"}
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
 
-            config = {"allowFullPaths": "yes"}
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text(json.dumps(config), encoding="utf-8")
+        result = load_allow_full_paths(self.config_dir)
 
-            result = load_allow_full_paths(ws.path)
-
-            self.assertFalse(result)
+        self.assertFalse(result)
 
     def test_load_allow_full_paths_ignores_invalid_json(self) -> None:
         """Returns default when config is invalid JSON."""
-        with TempWorkspace() as ws:
-            from config import load_allow_full_paths
-
-            config_path = ws.path / "appsettings.json"
-            config_path.write_text("not valid json", encoding="utf-8")
+        config_path = self.config_dir / "appsettings.json"
+        config_path.write_text("not valid json", encoding="utf-8")
 
-            result = load_allow_full_paths(ws.path)
+        result = load_allow_full_paths(self.config_dir)
 
-            self.assertFalse(result)
+        self.assertFalse(result)
 
 
 if __name__ == "__main__":
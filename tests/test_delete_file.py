@@ -4,16 +4,12 @@ Tests the delete file tool including file deletion,
 directory deletion, and error handling.
 """
 
-import sys
 import unittest
-from pathlib import Path
-
-# Add parent directory to path for module imports
-_parent_dir = str(Path(__file__).parent.parent)
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
 
+from session_state import session
 from tests.test_utils import TempWorkspace, run_async
+from tools.delete_file import delete_file
+from tools.read_file import read_file
 
 
 class TestDeleteFileBasic(unittest.TestCase):
@@ -22,9 +18,6 @@ class TestDeleteFileBasic(unittest.TestCase):
     def test_delete_file_removes_file(self) -> None:
         """Verify file is deleted."""
         with TempWorkspace() as workspace:
-            from session_state import session
-            from tools.delete_file import delete_file
-
             session.clear()
 
             file_path = workspace.create_file("to_delete.txt", "content")
@@ -44,9 +37,6 @@ class TestDeleteFileDirectory(unittest.TestCase):
     def test_delete_empty_directory(self) -> None:
         """Verify empty directory is deleted."""
         with TempWorkspace() as workspace:
-            from session_state import session
-            from tools.delete_file import delete_file
-
             session.clear()
 
             dir_path = workspace.create_dir("empty_folder")
@@ -62,9 +52,6 @@ class TestDeleteFileDirectory(unittest.TestCase):
     def test_delete_nonempty_directory_returns_error(self) -> None:
         """Verify non-empty directory cannot be deleted."""
         with TempWorkspace() as workspace:
-            from session_state import session
-            from tools.delete_file import delete_file
-
             session.clear()
 
             workspace.create_file("folder/file.txt", "content")
@@ -84,9 +71,6 @@ class TestDeleteFileErrors(unittest.TestCase):
     def test_delete_nonexistent_file_returns_error(self) -> None:
         """Verify error when file doesn't exist."""
         with TempWorkspace():
-            from session_state import session
-            from tools.delete_file import delete_file
-
             session.clear()
 
             result = run_async(delete_file("nonexistent.txt"))
@@ -102,10 +86,6 @@ class TestDeleteFileCacheManagement(unittest.TestCase):
     def test_delete_file_removes_from_cache(self) -> None:
         """Verify deleted file is removed from session cache."""
         with TempWorkspace() as workspace:
-            from session_state import session
-            from tools.delete_file import delete_file
-            from tools.read_file import read_file
-
             session.clear()
 
             workspace.create_file("tracked.txt", "content")
@@ -4,30 +4,32 @@ Tests file change detection including modified, deleted, and unchanged files,
 as well as line range calculation.
 """
 
-import sys
+import os
 import unittest
-from pathlib import Path
-
-# Add parent directory to path for module imports
-_parent_dir = str(Path(__file__).parent.parent)
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
+from unittest.mock import patch
 
+import file_watcher
+from file_watcher import calculate_changed_line_ranges, get_changed_files
+from path_utils import get_file_mtime_ms
+from session_state import session
 from tests.test_utils import TempWorkspace
 
+# Shared "line1\nline2\n..." inputs for the line range cases
+LINES2 = "\n".join(f"line{i}" for i in range(1, 3))
+LINES3 = "\n".join(f"line{i}" for i in range(1, 4))
+LINES5 = "\n".join(f"line{i}" for i in range(1, 6))
+LINES7 = "\n".join(f"line{i}" for i in range(1, 8))
+
 
 class TestChangeDetection(unittest.TestCase):
     """Tests for file change detection."""
 
+    def setUp(self) -> None:
+        session.clear()
+
     def test_detect_modified_file(self) -> None:
         """Verify modified files are detected."""
         with TempWorkspace() as ws:
-            from file_watcher import get_changed_files
-            from path_utils import get_file_mtime_ms
-            from session_state import session
-
-            session.clear()
-
             # Create and track a file
             file_path = ws.create_file("test.txt", "initial content")
             mtime = get_file_mtime_ms(file_path)
@@ -39,16 +41,9 @@ class TestChangeDetection(unittest.TestCase):
             self.assertEqual(changed[0]["path"], str(file_path))
             self.assertEqual(changed[0]["status"], "modified")
 
-            session.clear()
-
     def test_detect_deleted_file(self) -> None:
         """Verify deleted files are detected once and then untracked."""
         with TempWorkspace() as ws:
-            from file_watcher import get_changed_files
-            from session_state import session
-
-            session.clear()
-
             # Track a file that doesn't exist
             fake_path = ws.path / "deleted.txt"
             session.track_file(str(fake_path), 12345, "content")
@@ -62,17 +57,9 @@ class TestChangeDetection(unittest.TestCase):
             self.assertNotIn(str(fake_path), session.mtimes)
             self.assertNotIn(str(fake_path), session.contents)
 
-            session.clear()
-
     def test_no_changes_when_mtime_unchanged(self) -> None:
         """Verify no changes reported when file unchanged."""
         with TempWorkspace() as ws:
-            from file_watcher import get_changed_files
-            from path_utils import get_file_mtime_ms
-            from session_state import session
-
-            session.clear()
-
             file_path = ws.create_file("test.txt", "content")
             mtime = get_file_mtime_ms(file_path)
             session.track_file(str(file_path), mtime, "content")
@@ -81,150 +68,89 @@ class TestChangeDetection(unittest.TestCase):
 
             self.assertEqual(len(changed), 0)
 
-            session.clear()
-
-
-class TestLineRangeCalculation(unittest.TestCase):
-    """Tests for line range calculation in diffs."""
-
-    def test_changed_line_ranges_simple_modification(self) -> None:
-        """Verify line ranges are calculated for simple changes."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = "line1\nline2\nline3"
-        new_content = "line1\nMODIFIED\nline3"
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # Should indicate changes around line 2
-        self.assertIn("2", ranges)
-
-    def test_changed_line_ranges_addition(self) -> None:
-        """Verify line ranges for added lines."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = "line1\nline2"
-        new_content = "line1\nline2\nline3"
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # Should indicate addition at end
-        self.assertIn("3", ranges)
-
-    def test_changed_line_ranges_deletion(self) -> None:
-        """Verify line ranges for deleted lines."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = "line1\nline2\nline3"
-        new_content = "line1\nline3"
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # Should indicate change around line 2
-        self.assertIn("2", ranges)
-
-    def test_changed_line_ranges_format_single_line(self) -> None:
-        """Verify format for single changed line."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = "line1\nline2\nline3"
-        new_content = "line1\nMODIFIED\nline3"
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # Single changed line should be "2" or similar, not range
-        self.assertEqual(ranges, "2")
-
-    def test_changed_line_ranges_format_range(self) -> None:
-        """Verify format for contiguous range of changed lines."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = "line1\nline2\nline3\nline4\nline5"
-        new_content = "line1\nMOD2\nMOD3\nMOD4\nline5"
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # Three contiguous lines should be "2-4"
-        self.assertEqual(ranges, "2-4")
-
-    def test_changed_line_ranges_multiple_ranges(self) -> None:
-        """Verify format for multiple non-adjacent changed ranges."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = "line1\nline2\nline3\nline4\nline5\nline6\nline7"
-        new_content = "line1\nMOD2\nMOD3\nline4\nline5\nMOD6\nline7"
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # Two ranges: 2-3 and 6
-        self.assertEqual(ranges, "2-3,6")
-
-    def test_changed_line_ranges_empty_both(self) -> None:
-        """Verify behavior when both old and new content are empty."""
-        from file_watcher import calculate_changed_line_ranges
-
-        ranges = calculate_changed_line_ranges("", "")
-        self.assertEqual(ranges, "1-EOF")
-
-    def test_changed_line_ranges_empty_to_content(self) -> None:
-        """Verify behavior when adding to empty file."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = ""
-        new_content = "line1\nline2\nline3"
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # All lines in new file should be marked as changed
-        self.assertEqual(ranges, "1-3")
-
-    def test_changed_line_ranges_content_to_empty(self) -> None:
-        """Verify behavior when deleting all content."""
-        from file_watcher import calculate_changed_line_ranges
-
-        old_content = "line1\nline2\nline3"
-        new_content = ""
-
-        ranges = calculate_changed_line_ranges(old_content, new_content)
-
-        # Empty result after deletion
-        self.assertEqual(ranges, "1-EOF")
+    def test_touched_file_with_same_content_is_not_reported(self) -> None:
+        """Verify a newer mtime with identical content is absorbed silently."""
+        with TempWorkspace() as ws:
+            file_path = ws.create_file("test.txt", "content")
+            mtime = get_file_mtime_ms(file_path)
+            session.track_file(str(file_path), mtime - 1000, "content")
 
-    def test_changed_line_ranges_single_line_file(self) -> None:
-        """Verify behavior with single-line files."""
-        from file_watcher import calculate_changed_line_ranges
+            changed = get_changed_files()
 
-        old_content = "single"
-        new_content = "MODIFIED"
+            self.assertEqual(changed, [])
+            self.assertEqual(session.mtimes[str(file_path)], mtime)
 
-        ranges = calculate_changed_line_ranges(old_content, new_content)
+    def test_size_change_with_same_mtime_is_reported(self) -> None:
+        """Verify a size change is caught even when the mtime did not move."""
+        with TempWorkspace() as ws:
+            file_path = ws.create_file("test.txt", "line 1\n")
+            stat = os.stat(file_path)
+            session.track_file(str(file_path), stat.st_mtime_ns // 1_000_000, "line 1\n", stat.st_size)
 
-        # Single line change
-        self.assertEqual(ranges, "1")
+            file_path.write_text("line 1\nline 2\n", encoding="utf-8")
+            os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
 
-    def test_changed_line_ranges_middle_addition(self) -> None:
-        """Verify lines added in middle are tracked correctly."""
-        from file_watcher import calculate_changed_line_ranges
+            changed = get_changed_files()
 
-        old_content = "line1\nline2\nline3"
-        new_content = "line1\nline2\nADDED1\nADDED2\nline3"
+            self.assertEqual(len(changed), 1)
+            self.assertEqual(changed[0]["status"], "modified")
+            self.assertEqual(changed[0]["changedLineRanges"], "2")
 
-        ranges = calculate_changed_line_ranges(old_content, new_content)
+    def test_several_files_in_one_directory(self) -> None:
+        """Verify each tracked file is reported correctly, with and without listings."""
+        for from_listings in (False, True):
+            with self.subTest(from_listings=from_listings), TempWorkspace() as ws, \
+                    patch.object(file_watcher, "_STAT_FROM_LISTINGS", from_listings):
+                session.clear()
+                unchanged = ws.create_file("sub/unchanged.txt", "same")
+                modified = ws.create_file("sub/modified.txt", "new")
+                deleted = ws.path / "sub" / "deleted.txt"
+                ws.create_file("sub/untracked.txt", "ignored")
+                session.track_file(str(unchanged), get_file_mtime_ms(unchanged), "same")
+                session.track_file(str(modified), get_file_mtime_ms(modified) - 1000, "old")
+                session.track_file(str(deleted), 12345, "gone")
 
-        # Lines 3 and 4 should be marked as additions
-        self.assertEqual(ranges, "3-4")
+                changed = {entry["path"]: entry["status"] for entry in get_changed_files()}
 
-    def test_changed_line_ranges_complex_scenario(self) -> None:
-        """Verify complex scenario with multiple additions, deletions, and modifications."""
-        from file_watcher import calculate_changed_line_ranges
+                self.assertEqual(changed, {str(modified): "modified", str(deleted): "deleted"})
 
-        old_content = "a\nb\nc\nd\ne\nf\ng"
-        new_content = "a\nB_MOD\nc\nD_MOD\nE_MOD\nNEW\ng"
 
-        ranges = calculate_changed_line_ranges(old_content, new_content)
+class TestLineRangeCalculation(unittest.TestCase):
+    """Tests for line range calculation in diffs."""
 
-        # Changes at lines 2,4,5,6
-        self.assertEqual(ranges, "2,4-6")
+    def test_changed_line_ranges_cases(self) -> None:
+        """Verify the reported ranges for each kind of edit."""
+        repeated = ["same"] * 500
+        repeated_edited = list(repeated)
+        repeated_edited[249] = "MODIFIED"
+        repeated_edited.insert(400, "ADDED")
+
+        cases = [
+            # (name, old_content, new_content, expected)
+            ("single modified line", LINES3, "line1\nMODIFIED\nline3", "2"),
+            ("addition at end", LINES2, LINES3, "3"),
+            ("contiguous range", LINES5, "line1\nMOD2\nMOD3\nMOD4\nline5", "2-4"),
+            (
+                "multiple ranges",
+                LINES7,
+                "line1\nMOD2\nMOD3\nline4\nline5\nMOD6\nline7",
+                "2-3,6",
+            ),
+            ("both empty", "", "", "1-EOF"),
+            ("empty to content", "", LINES3, "1-3"),
+            ("content to empty", LINES3, "", "1-EOF"),
+            ("single-line file", "single", "MODIFIED", "1"),
+            ("middle addition", LINES3, "line1\nline2\nADDED1\nADDED2\nline3", "3-4"),
+            ("mixed edits", "a\nb\nc\nd\ne\nf\ng", "a\nB_MOD\nc\nD_MOD\nE_MOD\nNEW\ng", "2,4-6"),
+            # Pure deletions have no new line to point at: whole new file
+            ("deleted middle line", LINES3, "line1\nline3", "1-2"),
+            ("only deletions", "a\nb\nc\nd", "a\nd", "1-2"),
+            # Edits among identical lines, located after trimming the unchanged ends
+            ("repeated lines", "\n".join(repeated), "\n".join(repeated_edited), "250,401"),
+        ]
+        for name, old_content, new_content, expected in cases:
+            with self.subTest(name):
+                self.assertEqual(calculate_changed_line_ranges(old_content, new_content), expected)
 
 
 if __name__ == "__main__":
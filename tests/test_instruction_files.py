@@ -4,67 +4,64 @@ Tests instruction file discovery including parent traversal,
 priority order, and visibility behavior.
 """
 
-import sys
 import unittest
-from pathlib import Path
 
-# Add parent directory to path for module imports
-_parent_dir = str(Path(__file__).parent.parent)
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
-
-from tests.test_utils import TempWorkspace
+from instruction_files import find_instruction_files_in_parents, include_instruction_file_content
+from session_state import session
+from tests.test_utils import TempWorkspace, session_at
 
 
 class TestInstructionFileDiscovery(unittest.TestCase):
-    """Tests for finding instruction files in parent directories."""
+    """Tests for finding instruction files in parent directories.
+
+    The tests only read the workspace, so one workspace is built per class.
+    The clear count is pinned to 0 so the base AGENTS.md is always excluded.
+    """
+
+    _ws: TempWorkspace
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._ws = TempWorkspace().__enter__()
+        ws = cls._ws
+        ws.create_file("AGENTS.md", "# Root Instructions")
+        ws.create_file("test.txt", "content")
+        ws.create_file("parent/AGENTS.md", "# Instructions")
+        ws.create_file("parent/child/test.txt", "content")
+        ws.create_file("level1/AGENTS.md", "# Level 1")
+        ws.create_file("level1/level2/AGENTS.md", "# Level 2")
+        ws.create_file("level1/level2/level3/test.txt", "content")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._ws.__exit__(None, None, None)
+
+    def setUp(self) -> None:
+        pinned = session_at(0)
+        pinned.__enter__()
+        self.addCleanup(pinned.__exit__, None, None, None)
 
     def test_find_instruction_files_in_parent_directory(self) -> None:
         """Verify instruction files are found walking up."""
-        with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
+        ws = self._ws
 
-            parent = ws.create_dir("parent")
-            agents_md = ws.create_file("parent/AGENTS.md", "# Instructions")
-            test_file = ws.create_file("parent/child/test.txt", "content")
+        found = find_instruction_files_in_parents(ws.path / "parent/child/test.txt")
 
-            found = find_instruction_files_in_parents(test_file)
-
-            self.assertEqual(len(found), 1)
-            self.assertEqual(found[0][0], parent)
-            self.assertEqual(found[0][1], agents_md)
+        self.assertEqual(len(found), 1)
+        self.assertEqual(found[0][0], ws.path / "parent")
+        self.assertEqual(found[0][1], ws.path / "parent/AGENTS.md")
 
     def test_instruction_file_at_base_dir_excluded(self) -> None:
         """Verify instruction files at BASE_DIR are not included on first session."""
-        with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
-            from session_state import session
-
-            old_count = session.new_session_clear_count
-            session.new_session_clear_count = 0
+        found = find_instruction_files_in_parents(self._ws.path / "test.txt")
 
-            try:
-                ws.create_file("AGENTS.md", "# Root Instructions")
-                test_file = ws.create_file("test.txt", "content")
-
-                found = find_instruction_files_in_parents(test_file)
-
-                self.assertEqual(len(found), 0)
-            finally:
-                session.new_session_clear_count = old_count
+        self.assertEqual(len(found), 0)
 
     def test_multiple_parents_discovered(self) -> None:
         """Verify instruction files from multiple parent levels are found."""
-        with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
+        found = find_instruction_files_in_parents(self._ws.path / "level1/level2/level3/test.txt")
 
-            ws.create_file("level1/AGENTS.md", "# Level 1")
-            ws.create_file("level1/level2/AGENTS.md", "# Level 2")
-            test_file = ws.create_file("level1/level2/level3/test.txt", "content")
-
-            found = find_instruction_files_in_parents(test_file)
-
-            self.assertEqual(len(found), 2)
+        self.assertEqual(len(found), 2)
 
 
 class TestInstructionFilePriority(unittest.TestCase):
@@ -73,8 +70,6 @@ class TestInstructionFilePriority(unittest.TestCase):
     def test_priority_order_selects_first_match(self) -> None:
         """Verify higher priority files are selected over lower."""
         with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
-
             parent = ws.create_dir("parent")
             agents_md = ws.create_file("parent/AGENTS.md", "# AGENTS")
             ws.create_file("parent/CLAUDE.md", "# CLAUDE")
@@ -89,17 +84,12 @@ class TestInstructionFilePriority(unittest.TestCase):
 class TestInstructionFileVisibility(unittest.TestCase):
     """Tests for content append vs path-only visibility."""
 
+    def setUp(self) -> None:
+        session.clear()
+
     def test_second_read_shows_path_after_content_was_appended(self) -> None:
         """Verify later reads still advertise the selected instruction file path."""
         with TempWorkspace() as ws:
-            from instruction_files import (
-                find_instruction_files_in_parents,
-                include_instruction_file_content,
-            )
-            from session_state import session
-
-            session.clear()
-
             agents_path = ws.create_file("parent/AGENTS.md", "# Instructions")
             test_file = ws.create_file("parent/child/test.txt", "content")
 
@@ -114,19 +104,9 @@ class TestInstructionFileVisibility(unittest.TestCase):
             self.assertIn(str(agents_path), content2)
             self.assertNotIn("# Instructions", content2)
 
-            session.clear()
-
     def test_priority_file_path_is_used_for_path_only_output(self) -> None:
         """Verify AGENTS.md remains the surfaced path when both files exist."""
         with TempWorkspace() as ws:
-            from instruction_files import (
-                find_instruction_files_in_parents,
-                include_instruction_file_content,
-            )
-            from session_state import session
-
-            session.clear()
-
             agents_path = ws.create_file("parent/AGENTS.md", "# AGENTS")
             claude_path = ws.create_file("parent/CLAUDE.md", "# CLAUDE")
             test_file = ws.create_file("parent/child/test.txt", "content")
@@ -137,120 +117,71 @@ class TestInstructionFileVisibility(unittest.TestCase):
             self.assertIn(str(agents_path), content2)
             self.assertNotIn(str(claude_path), content2)
 
-            session.clear()
-
 
 class TestBaseDirectoryInstructionFiles(unittest.TestCase):
-    """Tests for base directory instruction file inclusion after compaction."""
+    """Tests for base directory instruction file inclusion after compaction.
 
-    def test_base_dir_excluded_on_first_session(self) -> None:
-        """Verify base dir instruction files excluded on initial session."""
-        with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
-            from session_state import session
+    The tests only read the workspace, so one workspace is built per class;
+    each test runs at the clear count it needs via session_at.
+    """
 
-            old_count = session.new_session_clear_count
-            session.new_session_clear_count = 0
+    _ws: TempWorkspace
 
-            try:
-                ws.create_file("AGENTS.md", "# Root Instructions")
-                test_file = ws.create_file("test.txt", "content")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._ws = TempWorkspace().__enter__()
+        ws = cls._ws
+        cls.base_agents = ws.create_file("AGENTS.md", "# Root Instructions")
+        cls.test_file = ws.create_file("test.txt", "content")
+        cls.parent_agents = ws.create_file("parent/AGENTS.md", "# Parent")
+        cls.child_file = ws.create_file("parent/child/test.txt", "content")
 
-                found = find_instruction_files_in_parents(test_file)
-                self.assertEqual(len(found), 0)
-            finally:
-                session.new_session_clear_count = old_count
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._ws.__exit__(None, None, None)
+
+    def test_base_dir_excluded_on_first_session(self) -> None:
+        """Verify base dir instruction files excluded on initial session."""
+        with session_at(0):
+            found = find_instruction_files_in_parents(self.test_file)
+            self.assertEqual(len(found), 0)
 
     def test_base_dir_excluded_after_first_clear(self) -> None:
         """Verify base dir instruction files still excluded after only one clear."""
-        with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
-            from session_state import session
-
-            old_count = session.new_session_clear_count
-            session.new_session_clear_count = 1
-
-            try:
-                ws.create_file("AGENTS.md", "# Root Instructions")
-                test_file = ws.create_file("test.txt", "content")
-
-                found = find_instruction_files_in_parents(test_file)
-                self.assertEqual(len(found), 0)
-            finally:
-                session.new_session_clear_count = old_count
+        with session_at(1):
+            found = find_instruction_files_in_parents(self.test_file)
+            self.assertEqual(len(found), 0)
 
     def test_base_dir_included_after_second_clear(self) -> None:
         """Verify base dir instruction files included after compaction (2nd clear)."""
-        with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
-            from session_state import session
-
-            old_count = session.new_session_clear_count
-            session.new_session_clear_count = 2
+        with session_at(2):
+            found = find_instruction_files_in_parents(self.test_file)
 
-            try:
-                base_agents = ws.create_file("AGENTS.md", "# Root Instructions")
-                test_file = ws.create_file("test.txt", "content")
-
-                found = find_instruction_files_in_parents(test_file)
-
-                self.assertEqual(len(found), 1)
-                self.assertEqual(found[0][1], base_agents)
-            finally:
-                session.new_session_clear_count = old_count
+            self.assertEqual(len(found), 1)
+            self.assertEqual(found[0][1], self.base_agents)
 
     def test_base_dir_included_alongside_parent_files(self) -> None:
         """Verify base dir files are included together with parent dir files."""
-        with TempWorkspace() as ws:
-            from instruction_files import find_instruction_files_in_parents
-            from session_state import session
-
-            old_count = session.new_session_clear_count
-            session.new_session_clear_count = 2
-
-            try:
-                base_agents = ws.create_file("AGENTS.md", "# Root")
-                parent_agents = ws.create_file("parent/AGENTS.md", "# Parent")
-                test_file = ws.create_file("parent/child/test.txt", "content")
+        with session_at(2):
+            found = find_instruction_files_in_parents(self.child_file)
 
-                found = find_instruction_files_in_parents(test_file)
-
-                self.assertEqual(len(found), 2)
-                self.assertEqual(found[0][1], parent_agents)
-                self.assertEqual(found[1][1], base_agents)
-            finally:
-                session.new_session_clear_count = old_count
+            self.assertEqual(len(found), 2)
+            self.assertEqual(found[0][1], self.parent_agents)
+            self.assertEqual(found[1][1], self.base_agents)
 
     def test_base_dir_second_read_shows_path_after_initial_append(self) -> None:
         """Verify base dir instruction files remain visible by path after append."""
-        with TempWorkspace() as ws:
-            from instruction_files import (
-                find_instruction_files_in_parents,
-                include_instruction_file_content,
+        with session_at(2):
+            content1 = include_instruction_file_content(
+                find_instruction_files_in_parents(self.test_file)
             )
-            from session_state import session
-
-            old_count = session.new_session_clear_count
-            session.new_session_clear_count = 2
-            session.appended_instruction_folders.clear()
-
-            try:
-                base_agents = ws.create_file("AGENTS.md", "# Root Instructions")
-                test_file = ws.create_file("test.txt", "content")
-
-                content1 = include_instruction_file_content(
-                    find_instruction_files_in_parents(test_file)
-                )
-                self.assertIn("Root Instructions", content1)
-
-                content2 = include_instruction_file_content(
-                    find_instruction_files_in_parents(test_file)
-                )
-                self.assertIn(str(base_agents), content2)
-                self.assertIn("[Instruction file available]", content2)
-            finally:
-                session.new_session_clear_count = old_count
-                session.appended_instruction_folders.clear()
+            self.assertIn("Root Instructions", content1)
+
+            content2 = include_instruction_file_content(
+                find_instruction_files_in_parents(self.test_file)
+            )
+            self.assertIn(str(self.base_agents), content2)
+            self.assertIn("[Instruction file available]", content2)
 
 
 if __name__ == "__main__":
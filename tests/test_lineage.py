@@ -3,7 +3,8 @@
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 # Add parent directory to path for module imports
 _parent_dir = str(Path(__file__).parent.parent)
@@ -86,5 +87,263 @@ class TestLineageReadNormalization(unittest.TestCase):
         read_file_mock.assert_awaited_once_with("test.txt", False, None, None, 0, 50000)
 
 
+class TestLineageIntCoercion(unittest.TestCase):
+    """Tests for optional integer argument coercion."""
+
+    def test_integer_strings_are_converted(self) -> None:
+        """Padded and signed integer strings should become ints."""
+        import lineage
+
+        self.assertEqual(lineage._coerce_optional_int("offset", " 12 "), 12)
+        self.assertEqual(lineage._coerce_optional_int("offset", "-3"), -3)
+        self.assertEqual(lineage._coerce_optional_int("offset", 7), 7)
+
+    def test_non_integer_strings_are_rejected(self) -> None:
+        """Strings int() would otherwise accept loosely are rejected."""
+        import lineage
+
+        for value in ("1_000", "1.5", "abc", "\u0661\u0662"):
+            with self.assertRaisesRegex(ValueError, "'cursor' must be an integer"):
+                lineage._coerce_optional_int("cursor", value)
+
+
+class TestLineageToolList(unittest.TestCase):
+    """Tests for the memoized tools/list response."""
+
+    def test_list_tools_is_built_once(self) -> None:
+        """Repeated tools/list calls should reuse the same tool list."""
+        import lineage
+
+        first = run_async(lineage.mcp.list_tools())
+        second = run_async(lineage.mcp.list_tools())
+
+        self.assertIs(first, second)
+        self.assertIn("read", [tool.name for tool in first])
+
+    def test_tools_return_text_without_structured_output(self) -> None:
+        """Tool results are plain text, not also wrapped as structured output."""
+        import lineage
+
+        tools = run_async(lineage.mcp.list_tools())
+
+        self.assertTrue(tools)
+        self.assertTrue(all(tool.outputSchema is None for tool in tools))
+
+    def test_interrupt_note_is_sent_once_in_server_instructions(self) -> None:
+        """The interrupt guidance is in the server instructions, not every tool."""
+        import lineage
+
+        tools = run_async(lineage.mcp.list_tools())
+
+        self.assertIn("MCP Tool Interrupt Active", lineage.mcp.instructions)
+        for tool in tools:
+            self.assertNotIn("MCP Tool Interrupt Active", tool.description)
+
+    def test_adding_a_tool_invalidates_cached_list(self) -> None:
+        """Registering a tool after a tools/list call should refresh the list."""
+        import lineage
+
+        server = lineage._LineageMCP("test")
+
+        async def ping() -> str:
+            """Ping."""
+            return "pong"
+
+        self.assertEqual(run_async(server.list_tools()), [])
+        server.add_tool(ping)
+        self.assertEqual([tool.name for tool in run_async(server.list_tools())], ["ping"])
+
+
+class TestLineageToolWrapper(unittest.TestCase):
+    """Tests for the shared tool wrapper."""
+
+    def test_interrupted_call_skips_tool_body(self) -> None:
+        """An interrupted session returns only the interrupt message."""
+        import lineage
+        from session_state import session
+
+        session.interrupted = True
+        try:
+            with patch.object(lineage, "delete_file", new=AsyncMock(return_value="deleted")) as delete_mock:
+                result = run_async(lineage.delete("test.txt"))
+        finally:
+            session.resume()
+
+        self.assertEqual(result, lineage.INTERRUPT_MESSAGE)
+        delete_mock.assert_not_awaited()
+
+    def test_result_gets_footer_and_tray_log(self) -> None:
+        """Tool results get the footer and are logged with their arguments."""
+        import lineage
+
+        fake_tray = Mock()
+        fake_tray.tray_available.return_value = True
+        log_mock = fake_tray.log_tool_call_nowait
+
+        with patch.object(lineage, "delete_file", new=AsyncMock(return_value="deleted")):
+            with patch.object(lineage, "get_response_footer", return_value="FOOTER"):
+                with patch.object(lineage, "_tray", fake_tray):
+                    result = run_async(lineage.delete("test.txt"))
+
+        self.assertEqual(result, "deleted\n\n---\nFOOTER")
+        log_mock.assert_called_once()
+        self.assertEqual(log_mock.call_args.args, ("delete",))
+        self.assertEqual(log_mock.call_args.kwargs["file_path"], "test.txt")
+
+    def test_unavailable_tray_is_not_logged(self) -> None:
+        """No tray log arguments are built while the tray is unavailable."""
+        import lineage
+
+        fake_tray = Mock()
+        fake_tray.tray_available.return_value = False
+
+        with patch.object(lineage, "delete_file", new=AsyncMock(return_value="deleted")):
+            with patch.object(lineage, "_tray", fake_tray):
+                run_async(lineage.delete("test.txt"))
+
+        fake_tray.log_tool_call_nowait.assert_not_called()
+
+    def test_lazy_tool_calls_through_to_tool_module(self) -> None:
+        """Lazy tool stand-ins import their module and call the real tool."""
+        import importlib
+
+        import lineage
+
+        # The package exports the delete_file function under the same name,
+        # so fetch the submodule itself rather than tools.delete_file
+        delete_module = importlib.import_module("tools.delete_file")
+
+        with patch.object(delete_module, "delete_file", new=AsyncMock(return_value="deleted")) as delete_mock:
+            result = run_async(lineage.delete_file("test.txt"))
+
+        self.assertEqual(result, "deleted")
+        delete_mock.assert_awaited_once_with("test.txt")
+
+    def test_tools_package_exports_functions_after_submodule_import(self) -> None:
+        """Importing a tool submodule first must not shadow the package's function export."""
+        import inspect
+        import tools.read_file  # noqa: F401
+        from tools import read_file
+
+        self.assertTrue(inspect.iscoroutinefunction(read_file))
+
+
+class TestLineageBatch(unittest.TestCase):
+    """Tests for the batch tool."""
+
+    def test_calls_run_in_order_with_one_footer(self) -> None:
+        """Each call's result is numbered, and the footer is added once."""
+        import lineage
+
+        with patch.object(lineage, "read_file", new=AsyncMock(side_effect=["one", "two"])) as read_mock:
+            with patch.object(lineage, "delete_file", new=AsyncMock(return_value="deleted")):
+                with patch.object(lineage, "get_read_char_limit", return_value=50000):
+                    with patch.object(lineage, "get_response_footer", return_value="FOOTER"):
+                        result = run_async(
+                            lineage.batch(
+                                [
+                                    {"tool": "read", "args": {"file_path": "a.txt"}},
+                                    {"tool": "delete", "args": {"file_path": "b.txt"}},
+                                    {"tool": "read", "args": {"file_path": "c.txt", "limit": "2"}},
+                                ]
+                            )
+                        )
+
+        self.assertEqual(result, "[1] read\none\n\n[2] delete\ndeleted\n\n[3] read\ntwo\n\n---\nFOOTER")
+        self.assertEqual(read_mock.await_args.args, ("c.txt", False, None, 2, None, 50000))
+
+    def test_bad_calls_report_errors_and_continue(self) -> None:
+        """Unknown tools and bad arguments are reported per call."""
+        import lineage
+
+        with patch.object(lineage, "delete_file", new=AsyncMock(return_value="deleted")):
+            with patch.object(lineage, "_append_footer", side_effect=lambda result, client_name=None: result):
+                result = run_async(
+                    lineage.batch(
+                        [
+                            {"tool": "clear"},
+                            {"tool": "delete", "args": {"path": "x"}},
+                            {"tool": "read", "args": {"file_path": "a.txt", "cursor": "abc"}},
+                            {"tool": "delete", "args": {"file_path": "b.txt"}},
+                        ]
+                    )
+                )
+
+        sections = result.split("\n\n")
+        self.assertTrue(sections[0].startswith("[1] clear\nError: Unknown tool: 'clear'"))
+        self.assertTrue(sections[1].startswith("[2] delete\nError: Invalid arguments for delete"))
+        self.assertIn("'cursor' must be an integer", sections[2])
+        self.assertEqual(sections[3], "[4] delete\ndeleted")
+
+
+class TestLineageClientName(unittest.TestCase):
+    """Tests for per-session client name caching."""
+
+    def test_client_name_is_looked_up_once_per_session(self) -> None:
+        """The clientInfo walk should only happen on the first lookup."""
+        import lineage
+
+        lookups = []
+
+        class FakeServerSession:
+            @property
+            def client_params(self):
+                lookups.append(1)
+                return SimpleNamespace(clientInfo=SimpleNamespace(name="OpenCode"))
+
+        ctx = SimpleNamespace(session=FakeServerSession())
+
+        self.assertEqual(lineage._get_client_name(ctx), "OpenCode")
+        self.assertEqual(lineage._get_client_name(ctx), "OpenCode")
+        self.assertEqual(len(lookups), 1)
+
+    def test_missing_client_params_is_not_cached(self) -> None:
+        """Sessions that have not initialized yet are looked up again later."""
+        import lineage
+
+        class FakeServerSession:
+            client_params = None
+
+        server_session = FakeServerSession()
+        ctx = SimpleNamespace(session=server_session)
+
+        self.assertIsNone(lineage._get_client_name(ctx))
+        server_session.client_params = SimpleNamespace(clientInfo=SimpleNamespace(name="VS Code"))
+        self.assertEqual(lineage._get_client_name(ctx), "VS Code")
+
+
+class TestLineageEventLoop(unittest.TestCase):
+    """Tests for optional uvloop selection."""
+
+    def test_uvloop_policy_installed_when_available(self) -> None:
+        """An importable uvloop should become the event loop policy."""
+        import asyncio
+
+        import lineage
+
+        class FakePolicy(asyncio.DefaultEventLoopPolicy):
+            pass
+
+        fake_uvloop = SimpleNamespace(EventLoopPolicy=FakePolicy)
+        original_policy = asyncio.get_event_loop_policy()
+        try:
+            with patch.dict(sys.modules, {"uvloop": fake_uvloop}):
+                self.assertTrue(lineage._use_uvloop())
+            self.assertIsInstance(asyncio.get_event_loop_policy(), FakePolicy)
+        finally:
+            asyncio.set_event_loop_policy(original_policy)
+
+    def test_missing_uvloop_keeps_default_policy(self) -> None:
+        """Without uvloop the default event loop policy is left alone."""
+        import asyncio
+
+        import lineage
+
+        original_policy = asyncio.get_event_loop_policy()
+        with patch.dict(sys.modules, {"uvloop": None}):
+            self.assertFalse(lineage._use_uvloop())
+        self.assertIs(asyncio.get_event_loop_policy(), original_policy)
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
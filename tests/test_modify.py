@@ -1,22 +1,18 @@
 """Tests for tools/modify.py module."""
 
-import sys
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-_parent_dir = str(Path(__file__).parent.parent)
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
-
+from file_watcher import get_changed_files
+from session_state import session
 from tests.test_utils import TempWorkspace, run_async
+from tools.modify import modify
 
 
 class TestModifyBasic(unittest.TestCase):
     def test_create_file(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([
                 {
@@ -32,9 +28,6 @@ class TestModifyBasic(unittest.TestCase):
 
     def test_create_existing_file_fails(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             ws.create_file("new.txt", "hello")
 
@@ -52,9 +45,6 @@ class TestModifyBasic(unittest.TestCase):
 
     def test_overwrite_file(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             file_path = ws.create_file("config.txt", "old")
 
@@ -72,9 +62,6 @@ class TestModifyBasic(unittest.TestCase):
 
     def test_overwrite_missing_file_creates_it(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
 
             result = run_async(modify([
@@ -91,9 +78,6 @@ class TestModifyBasic(unittest.TestCase):
 
     def test_append_file(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             file_path = ws.create_file("log.txt", "a")
 
@@ -111,9 +95,6 @@ class TestModifyBasic(unittest.TestCase):
 
     def test_append_missing_file_fails(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
 
             result = run_async(modify([
@@ -130,9 +111,6 @@ class TestModifyBasic(unittest.TestCase):
 
     def test_replace_one_match(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             file_path = ws.create_file("test.txt", "Hello, World!")
 
@@ -151,9 +129,6 @@ class TestModifyBasic(unittest.TestCase):
 
     def test_replace_all_matches(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             file_path = ws.create_file("test.txt", "foo foo foo")
 
@@ -171,13 +146,28 @@ class TestModifyBasic(unittest.TestCase):
             self.assertEqual(file_path.read_text(), "bar bar bar")
             session.clear()
 
+    def test_replace_one_with_several_matches_fails(self) -> None:
+        with TempWorkspace() as ws:
+            session.clear()
+            file_path = ws.create_file("test.txt", "foo foo foo")
+
+            result = run_async(modify([
+                {
+                    "file_path": "test.txt",
+                    "operation": "replace",
+                    "match_text": "foo",
+                    "text": "bar",
+                }
+            ]))
+
+            self.assertIn("Error: String found 3 times", result)
+            self.assertEqual(file_path.read_text(), "foo foo foo")
+            session.clear()
+
 
 class TestModifyValidation(unittest.TestCase):
     def test_empty_operations_fail(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([]))
             self.assertIn("No operations", result)
@@ -186,9 +176,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_invalid_on_error_fails(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([
                 {
@@ -203,9 +190,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_missing_file_path(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([
                 {
@@ -218,9 +202,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_missing_operation(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([
                 {
@@ -233,9 +214,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_missing_text(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([
                 {
@@ -248,9 +226,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_replace_missing_match_text(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             ws.create_file("test.txt", "hello")
             result = run_async(modify([
@@ -267,9 +242,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_invalid_occurrence(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             ws.create_file("test.txt", "hello")
             result = run_async(modify([
@@ -286,9 +258,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_match_text_for_non_replace_fails(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([
                 {
@@ -303,9 +272,6 @@ class TestModifyValidation(unittest.TestCase):
 
     def test_occurrence_for_non_replace_fails(self) -> None:
         with TempWorkspace():
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             result = run_async(modify([
                 {
@@ -322,9 +288,6 @@ class TestModifyValidation(unittest.TestCase):
 class TestModifyBatchBehavior(unittest.TestCase):
     def test_mixed_batch_across_multiple_files(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             ws.create_file("b.txt", "old")
             ws.create_file("c.txt", "before")
@@ -357,9 +320,6 @@ class TestModifyBatchBehavior(unittest.TestCase):
 
     def test_multiple_operations_same_file_are_ordered(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             file_path = ws.create_file("app.py", "DEBUG = True")
 
@@ -384,9 +344,6 @@ class TestModifyBatchBehavior(unittest.TestCase):
 
     def test_abort_stops_later_operations(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             file_path = ws.create_file("a.txt", "hello")
 
@@ -417,9 +374,6 @@ class TestModifyBatchBehavior(unittest.TestCase):
 
     def test_continue_keeps_going_after_failure(self) -> None:
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             file_path = ws.create_file("a.txt", "hello")
 
@@ -441,14 +395,149 @@ class TestModifyBatchBehavior(unittest.TestCase):
             self.assertEqual(file_path.read_text(), "hello!")
             session.clear()
 
+    def test_continue_across_files_preserves_order(self) -> None:
+        with TempWorkspace() as ws:
+            session.clear()
+            ws.create_file("a.txt", "a")
+            ws.create_file("b.txt", "b")
+
+            result = run_async(modify([
+                {
+                    "file_path": "a.txt",
+                    "operation": "append",
+                    "text": "1",
+                },
+                {
+                    "file_path": "b.txt",
+                    "operation": "append",
+                    "text": "1",
+                },
+                {
+                    "file_path": "missing.txt",
+                    "operation": "append",
+                    "text": "x",
+                },
+                {
+                    "file_path": "a.txt",
+                    "operation": "append",
+                    "text": "2",
+                },
+                {
+                    "file_path": "b.txt",
+                    "operation": "replace",
+                    "match_text": "b1",
+                    "text": "B",
+                },
+            ], on_error="continue"))
+
+            lines = result.split("\n")
+            for number in range(1, 6):
+                self.assertTrue(lines[number - 1].startswith(f"Operation {number} "))
+            self.assertIn("File not found", lines[2])
+            self.assertEqual((ws.path / "a.txt").read_text(), "a12")
+            self.assertEqual((ws.path / "b.txt").read_text(), "B")
+            session.clear()
+
+    def test_continue_runs_dependent_paths_in_order(self) -> None:
+        with TempWorkspace() as ws:
+            session.clear()
+
+            result = run_async(modify([
+                {
+                    "file_path": "pkg",
+                    "operation": "create",
+                    "text": "not a directory",
+                },
+                {
+                    "file_path": "pkg/module.py",
+                    "operation": "create",
+                    "text": "x = 1",
+                },
+                {
+                    "file_path": "other/file.txt",
+                    "operation": "overwrite",
+                    "text": "new",
+                },
+            ], on_error="continue"))
+
+            lines = result.split("\n")
+            self.assertIn("Successfully created", lines[0])
+            self.assertIn("Error", lines[1])
+            self.assertIn("Successfully overwrote", lines[2])
+            self.assertEqual((ws.path / "pkg").read_text(), "not a directory")
+            self.assertEqual((ws.path / "other" / "file.txt").read_text(), "new")
+            session.clear()
+
+    def test_same_file_edits_share_one_read_and_write(self) -> None:
+        with TempWorkspace() as ws:
+            session.clear()
+            file_path = ws.create_file("app.py", "A = 1\nB = 2\n")
+
+            with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_mock, \
+                    patch.object(Path, "write_text", autospec=True, side_effect=Path.write_text) as write_mock:
+                result = run_async(modify([
+                    {
+                        "file_path": "app.py",
+                        "operation": "replace",
+                        "match_text": "A = 1",
+                        "text": "A = 10",
+                    },
+                    {
+                        "file_path": "app.py",
+                        "operation": "replace",
+                        "match_text": "B = 2",
+                        "text": "B = 20",
+                    },
+                    {
+                        "file_path": "app.py",
+                        "operation": "append",
+                        "text": "C = 30\n",
+                    },
+                ]))
+
+            self.assertEqual(read_mock.call_count, 1)
+            self.assertEqual(write_mock.call_count, 1)
+            self.assertEqual(result.count("Successfully"), 3)
+            self.assertEqual(file_path.read_text(), "A = 10\nB = 20\nC = 30\n")
+            self.assertEqual(get_changed_files(), [])
+            session.clear()
+
+    def test_failed_edit_in_same_file_run_is_skipped(self) -> None:
+        with TempWorkspace() as ws:
+            session.clear()
+            file_path = ws.create_file("a.txt", "hello")
+
+            result = run_async(modify([
+                {
+                    "file_path": "a.txt",
+                    "operation": "replace",
+                    "match_text": "hello",
+                    "text": "hi",
+                },
+                {
+                    "file_path": "a.txt",
+                    "operation": "replace",
+                    "match_text": "hello",
+                    "text": "bye",
+                },
+                {
+                    "file_path": "a.txt",
+                    "operation": "append",
+                    "text": "!",
+                },
+            ], on_error="continue"))
+
+            lines = result.split("\n")
+            self.assertIn("Successfully replaced", lines[0])
+            self.assertIn("String not found", lines[1])
+            self.assertIn("Successfully appended", lines[2])
+            self.assertEqual(file_path.read_text(), "hi!")
+            session.clear()
+
 
 class TestModifyCacheBehavior(unittest.TestCase):
     def test_successful_writes_update_cache(self) -> None:
         with TempWorkspace() as ws:
-            from file_watcher import get_changed_files
-            from session_state import session
-            from tools.modify import modify
-
             session.clear()
             ws.create_file("test.txt", "Hello")
 
@@ -3,65 +3,143 @@
 Tests path resolution, security validation, and file metadata operations.
 """
 
+import shutil
 import sys
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
+
+import path_utils
+from path_utils import (
+    get_allow_full_paths,
+    get_file_mtime_ms,
+    resolve_path,
+    set_allow_full_paths,
+)
+from tests.test_utils import TempWorkspace
 
-# Add parent directory to path for module imports
-_parent_dir = str(Path(__file__).parent.parent)
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
 
-from tests.test_utils import TempWorkspace
+class TestPathResolution(unittest.TestCase):
+    """Tests for path resolution operations.
 
-from path_utils import resolve_path
+    Tests share one workspace; the one that switches base directories uses its own.
+    """
 
+    _ws: TempWorkspace
 
-class TestPathResolution(unittest.TestCase):
-    """Tests for path resolution operations."""
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._ws = TempWorkspace().__enter__()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._ws.__exit__(None, None, None)
 
     def test_resolve_path_returns_absolute_path(self) -> None:
         """Verify relative paths are resolved to absolute."""
-        with TempWorkspace() as ws:
-            from path_utils import resolve_path
-
-            result = resolve_path("subdir/file.txt")
+        result = resolve_path("subdir/file.txt")
 
-            self.assertTrue(result.success)
-            self.assertEqual(result.path, ws.path / "subdir" / "file.txt")
+        self.assertTrue(result.success)
+        self.assertEqual(result.path, self._ws.path / "subdir" / "file.txt")
 
     def test_resolve_path_allows_valid_nested_paths(self) -> None:
         """Verify valid nested paths are allowed."""
-        with TempWorkspace() as ws:
-            from path_utils import resolve_path
+        result = resolve_path("a/b/c/d/file.txt")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.path, self._ws.path / "a" / "b" / "c" / "d" / "file.txt")
 
-            result = resolve_path("a/b/c/d/file.txt")
+    def test_resolve_path_uses_current_base_dir(self) -> None:
+        """Verify the same relative path resolves against the current base."""
+        with TempWorkspace() as first_ws:
+            first = resolve_path("same.txt").path
+        with TempWorkspace() as second_ws:
+            second = resolve_path("same.txt").path
 
-            self.assertTrue(result.success)
-            self.assertEqual(result.path, ws.path / "a" / "b" / "c" / "d" / "file.txt")
+        self.assertEqual(first, first_ws.path / "same.txt")
+        self.assertEqual(second, second_ws.path / "same.txt")
 
 
 class TestPathSecurity(unittest.TestCase):
-    """Tests for path security validation."""
+    """Tests for path security validation.
+
+    Each test uses its own paths, so one workspace is built per class.
+    allowFullPaths is pinned off, since importing lineage applies appsettings.json.
+    """
+
+    _ws: TempWorkspace
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._ws = TempWorkspace().__enter__()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._ws.__exit__(None, None, None)
+
+    def setUp(self) -> None:
+        pinned = patch.object(path_utils, "_allow_full_paths", False)
+        pinned.start()
+        self.addCleanup(pinned.stop)
 
     def test_resolve_path_blocks_traversal_outside_base(self) -> None:
         """Verify directory traversal attacks are blocked."""
-        with TempWorkspace():
-            from path_utils import resolve_path
-
-            result = resolve_path("../../../etc/passwd")
+        result = resolve_path("../../../etc/passwd")
 
-            self.assertFalse(result.success)
-            self.assertIn("outside", result.error.lower())
+        self.assertFalse(result.success)
+        self.assertIn("outside", result.error.lower())
 
     def test_resolve_path_blocks_absolute_paths_outside_base(self) -> None:
         """Verify absolute paths outside base are blocked."""
-        with TempWorkspace():
-            from path_utils import resolve_path
+        result = resolve_path("/etc/passwd")
+
+        self.assertFalse(result.success)
+
+    def test_resolve_path_follows_component_replaced_by_symlink(self) -> None:
+        """Verify a directory later swapped for an outside symlink is blocked."""
+        outside = Path(f"{self._ws.path}-outside")
+        outside.mkdir()
+        self.addCleanup(shutil.rmtree, outside, ignore_errors=True)
+        swapped = self._ws.create_dir("swapped")
+
+        self.assertTrue(resolve_path("swapped/secret.txt").success)
+
+        swapped.rmdir()
+        try:
+            swapped.symlink_to(outside, target_is_directory=True)
+        except OSError as exc:
+            self.skipTest(f"symlinks unavailable: {exc}")
+        self.addCleanup(swapped.unlink)
+
+        result = resolve_path("swapped/secret.txt")
+
+        self.assertFalse(result.success)
+        self.assertIn("outside of the base directory", result.error)
 
-            result = resolve_path("/etc/passwd")
+    def test_resolve_path_empty_and_dot_return_base_dir(self) -> None:
+        """Verify the base directory itself resolves without a lookup."""
+        with patch.object(path_utils.os.path, "realpath") as resolve_mock:
+            for relative_path in ("", "."):
+                result = path_utils.resolve_path(relative_path)
+                self.assertTrue(result.success)
+                self.assertEqual(result.path, self._ws.path)
+
+        resolve_mock.assert_not_called()
 
+    def test_resolve_path_blocks_sibling_with_base_dir_prefix(self) -> None:
+        """Verify a sibling directory sharing the base name prefix is blocked."""
+        sibling = Path(f"{self._ws.path}2")
+        old_allow = path_utils._allow_full_paths
+        try:
+            path_utils._allow_full_paths = False
+            result = path_utils.resolve_path(f"../{sibling.name}/secret.txt")
             self.assertFalse(result.success)
+            self.assertIn("outside of the base directory", result.error)
+
+            self.assertTrue(path_utils.resolve_path(".").success)
+        finally:
+            path_utils._allow_full_paths = old_allow
 
 
 class TestAllowFullPaths(unittest.TestCase):
@@ -69,8 +147,6 @@ class TestAllowFullPaths(unittest.TestCase):
 
     def test_allows_traversal_when_enabled(self) -> None:
         """Verify paths outside base are allowed when allowFullPaths is True."""
-        import path_utils
-
         with TempWorkspace():
             old_allow = path_utils._allow_full_paths
             path_utils._allow_full_paths = True
@@ -83,8 +159,6 @@ class TestAllowFullPaths(unittest.TestCase):
 
     def test_allows_absolute_paths_when_enabled(self) -> None:
         """Verify absolute paths outside base are allowed when allowFullPaths is True."""
-        import path_utils
-
         with TempWorkspace():
             old_allow = path_utils._allow_full_paths
             path_utils._allow_full_paths = True
@@ -100,8 +174,6 @@ class TestAllowFullPaths(unittest.TestCase):
 
     def test_still_resolves_relative_paths_when_enabled(self) -> None:
         """Verify relative paths still resolve against base dir when allowFullPaths is True."""
-        import path_utils
-
         with TempWorkspace() as ws:
             old_allow = path_utils._allow_full_paths
             path_utils._allow_full_paths = True
@@ -115,8 +187,6 @@ class TestAllowFullPaths(unittest.TestCase):
 
     def test_blocks_traversal_when_disabled(self) -> None:
         """Verify paths outside base are blocked when allowFullPaths is False."""
-        import path_utils
-
         with TempWorkspace():
             old_allow = path_utils._allow_full_paths
             path_utils._allow_full_paths = False
@@ -129,9 +199,6 @@ class TestAllowFullPaths(unittest.TestCase):
 
     def test_set_allow_full_paths(self) -> None:
         """Verify set_allow_full_paths updates the global flag."""
-        import path_utils
-        from path_utils import get_allow_full_paths, set_allow_full_paths
-
         old_allow = path_utils._allow_full_paths
         try:
             set_allow_full_paths(True)
@@ -144,71 +211,76 @@ class TestAllowFullPaths(unittest.TestCase):
 
 
 class TestFileMtime(unittest.TestCase):
-    """Tests for file modification time operations."""
+    """Tests for file modification time operations.
+
+    The tests only add files, so one workspace is built per class.
+    """
+
+    _ws: TempWorkspace
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._ws = TempWorkspace().__enter__()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._ws.__exit__(None, None, None)
 
     def test_get_file_mtime_ms_returns_integer(self) -> None:
         """Verify mtime is returned in milliseconds as integer."""
-        with TempWorkspace() as ws:
-            from path_utils import get_file_mtime_ms
-
-            file_path = ws.create_file("test.txt", "content")
-            mtime = get_file_mtime_ms(file_path)
+        file_path = self._ws.create_file("integer.txt", "content")
+        mtime = get_file_mtime_ms(file_path)
 
-            self.assertIsInstance(mtime, int)
-            self.assertGreater(mtime, 0)
+        self.assertIsInstance(mtime, int)
+        self.assertGreater(mtime, 0)
 
     def test_get_file_mtime_ms_magnitude(self) -> None:
         """Verify mtime is in milliseconds, not seconds or nanoseconds."""
-        with TempWorkspace() as ws:
-            from path_utils import get_file_mtime_ms
-            import time
-
-            file_path = ws.create_file("test.txt", "content")
-            mtime_ms = get_file_mtime_ms(file_path)
-            current_time_ms = int(time.time() * 1000)
+        file_path = self._ws.create_file("magnitude.txt", "content")
+        mtime_ms = get_file_mtime_ms(file_path)
+        current_time_ms = int(time.time() * 1000)
 
-            # Mtime should be close to current time in milliseconds
-            # Should be within ~10 seconds (10000 ms) of now
-            self.assertLess(abs(mtime_ms - current_time_ms), 10000)
+        # Mtime should be close to current time in milliseconds
+        # Should be within ~10 seconds (10000 ms) of now
+        self.assertLess(abs(mtime_ms - current_time_ms), 10000)
 
-            # Sanity check: should be in milliseconds range (not seconds or nanoseconds)
-            # A reasonable file mtime is between Jan 2000 and Dec 2100
-            # In ms: 946684800000 to 4102444800000
-            self.assertGreater(mtime_ms, 946684800000)
-            self.assertLess(mtime_ms, 4102444800000)
+        # Sanity check: should be in milliseconds range (not seconds or nanoseconds)
+        # A reasonable file mtime is between Jan 2000 and Dec 2100
+        # In ms: 946684800000 to 4102444800000
+        self.assertGreater(mtime_ms, 946684800000)
+        self.assertLess(mtime_ms, 4102444800000)
 
     def test_get_file_mtime_ms_precision(self) -> None:
         """Verify mtime retains millisecond precision from st_mtime_ns."""
-        with TempWorkspace() as ws:
-            from path_utils import get_file_mtime_ms
+        file_path = self._ws.create_file("precision.txt", "content")
 
-            file_path = ws.create_file("test.txt", "content")
+        # Get both the raw stat and the converted mtime
+        stat = file_path.stat()
+        mtime_ms = get_file_mtime_ms(file_path)
 
-            # Get both the raw stat and the converted mtime
-            stat = file_path.stat()
-            mtime_ms = get_file_mtime_ms(file_path)
+        # Verify the conversion is exact integer math on st_mtime_ns
+        expected_mtime = stat.st_mtime_ns // 1_000_000
+        self.assertEqual(mtime_ms, expected_mtime)
 
-            # Verify the conversion is correct: st_mtime_ns / 1_000_000
-            expected_mtime = int(stat.st_mtime_ns / 1_000_000)
-            self.assertEqual(mtime_ms, expected_mtime)
+    def test_get_file_mtime_ms_accepts_string_path(self) -> None:
+        """Verify a plain string path gives the same mtime as a Path."""
+        file_path = self._ws.create_file("string_path.txt", "content")
+
+        self.assertEqual(get_file_mtime_ms(str(file_path)), get_file_mtime_ms(file_path))
 
     def test_get_file_mtime_ms_different_files_different_mtimes(self) -> None:
         """Verify different files can have different mtimes."""
-        import time
-        with TempWorkspace() as ws:
-            from path_utils import get_file_mtime_ms
-
-            file1 = ws.create_file("test1.txt", "content1")
-            mtime1 = get_file_mtime_ms(file1)
+        file1 = self._ws.create_file("test1.txt", "content1")
+        mtime1 = get_file_mtime_ms(file1)
 
-            # Small sleep to ensure different mtime
-            time.sleep(0.01)
+        # Small sleep to ensure different mtime
+        time.sleep(0.01)
 
-            file2 = ws.create_file("test2.txt", "content2")
-            mtime2 = get_file_mtime_ms(file2)
+        file2 = self._ws.create_file("test2.txt", "content2")
+        mtime2 = get_file_mtime_ms(file2)
 
-            # file2 should have a later mtime
-            self.assertGreater(mtime2, mtime1)
+        # file2 should have a later mtime
+        self.assertGreater(mtime2, mtime1)
 
 
 if __name__ == "__main__":
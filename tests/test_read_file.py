@@ -4,16 +4,16 @@ Tests the read file tool including basic reading, line numbers,
 partial reading, error handling, and session management.
 """
 
-import sys
+import os
+import threading
+import time
 import unittest
-from pathlib import Path
-
-# Add parent directory to path for module imports
-_parent_dir = str(Path(__file__).parent.parent)
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
 
+from file_watcher import get_changed_files
+from path_utils import get_file_mtime_ms
+from session_state import session
 from tests.test_utils import TempWorkspace, run_async
+from tools.read_file import read_file
 
 
 class TestReadFileBasic(unittest.TestCase):
@@ -22,9 +22,6 @@ class TestReadFileBasic(unittest.TestCase):
     def test_read_file_returns_content(self) -> None:
         """Verify file content is returned."""
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.read_file import read_file
-
             session.clear()
             ws.create_file("test.txt", "Hello, World!")
 
@@ -36,9 +33,6 @@ class TestReadFileBasic(unittest.TestCase):
     def test_read_file_not_found_returns_error(self) -> None:
         """Verify error is returned for non-existent file."""
         with TempWorkspace():
-            from session_state import session
-            from tools.read_file import read_file
-
             session.clear()
 
             result = run_async(read_file("nonexistent.txt"))
@@ -47,6 +41,74 @@ class TestReadFileBasic(unittest.TestCase):
             self.assertIn("not found", result.lower())
             session.clear()
 
+    def test_read_directory_returns_error(self) -> None:
+        """Verify error is returned when the path is a directory."""
+        with TempWorkspace() as ws:
+            session.clear()
+            (ws.path / "subdir").mkdir()
+
+            result = run_async(read_file("subdir"))
+
+            self.assertIn("Path is not a file", result)
+            session.clear()
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "FIFOs need POSIX")
+    def test_read_fifo_returns_error_without_blocking(self) -> None:
+        """Verify a FIFO is rejected without waiting for a writer."""
+        with TempWorkspace() as ws:
+            session.clear()
+            fifo_path = ws.path / "pipe"
+            os.mkfifo(fifo_path)
+            # If the open blocks, a late writer unblocks it so the test fails instead of hanging
+            writer = threading.Timer(5, lambda: os.close(os.open(fifo_path, os.O_WRONLY)))
+            writer.daemon = True
+            writer.start()
+            self.addCleanup(writer.cancel)
+
+            started = time.monotonic()
+            result = run_async(read_file("pipe"))
+
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertIn("Path is not a file", result)
+            session.clear()
+
+    def test_read_file_tracks_mtime_from_open_handle(self) -> None:
+        """Verify the tracked mtime matches the file's stat mtime."""
+        with TempWorkspace() as ws:
+            session.clear()
+            file_path = ws.create_file("test.txt", "Hello")
+
+            run_async(read_file("test.txt"))
+
+            self.assertEqual(session.mtimes[str(file_path)], get_file_mtime_ms(file_path))
+            session.clear()
+
+    def test_read_file_translates_newlines_like_text_mode(self) -> None:
+        """Verify CRLF and CR line endings are read as they are in text mode."""
+        with TempWorkspace() as ws:
+            session.clear()
+            file_path = ws.path / "crlf.txt"
+            file_path.write_bytes(b"one\r\ntwo\rthree\n")
+
+            result = run_async(read_file("crlf.txt"))
+
+            self.assertTrue(result.startswith("one\ntwo\nthree\n"))
+            self.assertNotIn("\r", result)
+            self.assertEqual(session.contents[str(file_path)], "one\ntwo\nthree\n")
+            self.assertEqual(get_changed_files(), [])
+            session.clear()
+
+    def test_read_file_keeps_content_after_ctrl_z(self) -> None:
+        """Verify a 0x1A byte is read as text, not as end of file."""
+        with TempWorkspace() as ws:
+            session.clear()
+            (ws.path / "ctrlz.txt").write_bytes(b"before\x1aafter\n")
+
+            result = run_async(read_file("ctrlz.txt"))
+
+            self.assertTrue(result.startswith("before\x1aafter\n"))
+            session.clear()
+
 
 class TestReadFileLineNumbers(unittest.TestCase):
     """Tests for line number formatting."""
@@ -54,9 +116,6 @@ class TestReadFileLineNumbers(unittest.TestCase):
     def test_read_file_with_line_numbers(self) -> None:
         """Verify line numbers are formatted correctly."""
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.read_file import read_file
-
             session.clear()
             ws.create_file("test.txt", "line1\nline2\nline3")
 
@@ -70,9 +129,6 @@ class TestReadFileLineNumbers(unittest.TestCase):
     def test_line_numbers_without_padding(self) -> None:
         """Verify line numbers don't have unnecessary padding."""
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.read_file import read_file
-
             session.clear()
             ws.create_file("test.txt", "a\nb\nc")
 
@@ -90,9 +146,6 @@ class TestReadFilePartial(unittest.TestCase):
     def test_read_file_partial_with_offset(self) -> None:
         """Verify offset skips lines correctly."""
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.read_file import read_file
-
             session.clear()
             ws.create_file("test.txt", "line0\nline1\nline2\nline3\nline4")
 
@@ -109,9 +162,6 @@ class TestReadFilePartial(unittest.TestCase):
     def test_read_file_offset_beyond_eof_returns_empty(self) -> None:
         """Verify offset beyond EOF returns empty content."""
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.read_file import read_file
-
             session.clear()
             ws.create_file("test.txt", "line1\nline2")
 
@@ -124,9 +174,6 @@ class TestReadFilePartial(unittest.TestCase):
     def test_read_file_negative_offset_returns_error(self) -> None:
         """Verify negative offset returns error."""
         with TempWorkspace() as ws:
-            from session_state import session
-            from tools.read_file import read_file
-
             session.clear()
             ws.create_file("test.txt", "content")
 
@@ -128,6 +128,70 @@ class TestSearchFilesAllowFullPaths(unittest.TestCase):
                 finally:
                     path_utils._allow_full_paths = old_allow
 
+    @unittest.skipIf(sys.platform == "win32", "symlinks need extra privileges on Windows")
+    def test_search_files_skips_symlinks_leaving_base_dir(self) -> None:
+        """Verify symlinked matches that resolve outside base_dir are dropped."""
+        import path_utils
+
+        with TempWorkspace() as workspace:
+            from tools.search_files import search_files
+
+            import tempfile
+            with tempfile.TemporaryDirectory() as outside_dir:
+                (Path(outside_dir) / "secret.py").write_text("secret", encoding="utf-8")
+                workspace.create_file("src/app.py", "app")
+                (workspace.path / "src" / "escape").symlink_to(outside_dir)
+
+                old_allow = path_utils._allow_full_paths
+                try:
+                    path_utils._allow_full_paths = False
+                    result = run_async(search_files("src/*/*.py"))
+                    self.assertNotIn("secret.py", result)
+                    result = run_async(search_files("src/*.py"))
+                    self.assertIn("app.py", result)
+                finally:
+                    path_utils._allow_full_paths = old_allow
+
+
+class TestSearchFilesGlobParity(unittest.TestCase):
+    """Tests that search results match Path.glob for the same pattern."""
+
+    def test_search_files_matches_path_glob(self) -> None:
+        """Verify the scandir walker and its fallbacks return what Path.glob does."""
+        with TempWorkspace() as workspace:
+            from tools.search_files import search_files
+
+            workspace.create_file("root.txt", "root")
+            workspace.create_file("a/one.txt", "one")
+            workspace.create_file("a/b/two.py", "two")
+            workspace.create_file("a/b/c/three.txt", "three")
+            workspace.create_dir("a/empty")
+
+            patterns = [
+                "*.txt",
+                "a/*",
+                "*/*.txt",
+                "**/*.txt",
+                "a/**/*.py",
+                "a/*/",
+                "*/",
+                "**/",
+                "a/**/",
+                "**",
+                "a/**",
+                "a/**/b/**",
+            ]
+            for pattern in patterns:
+                with self.subTest(pattern=pattern):
+                    result = run_async(search_files(pattern))
+
+                    found = {line[2:] for line in result.split("\n") if line.startswith("- ")}
+                    expected = {
+                        str(match.relative_to(workspace.path))
+                        for match in workspace.path.glob(pattern)
+                    }
+                    self.assertEqual(found, expected)
+
 
 class TestSearchFilesSessionManagement(unittest.TestCase):
     """Tests for session state management during search operations."""
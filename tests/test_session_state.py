@@ -7,6 +7,7 @@ and cache operations.
 import sys
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 # Add parent directory to path for module imports
 _parent_dir = str(Path(__file__).parent.parent)
@@ -38,6 +39,71 @@ class TestSessionState(unittest.TestCase):
         self.assertNotIn("/path/to/file.txt", state.mtimes)
         self.assertNotIn("/path/to/file.txt", state.contents)
 
+    def test_tracked_paths_are_interned(self) -> None:
+        """Verify tracked path keys are interned strings shared across caches."""
+        from session_state import SessionState
+
+        state = SessionState()
+        file_path = "".join(["/path/to/", "file.txt"])
+        state.track_file(file_path, 1234567890, "content")
+
+        key = next(iter(state.mtimes))
+        self.assertIs(key, sys.intern("/path/to/file.txt"))
+        self.assertIs(next(iter(state.contents)), key)
+
+    def test_lookups_do_not_intern(self) -> None:
+        """Verify lookup-only calls match equal strings without interning them."""
+        from session_state import SessionState
+
+        state = SessionState()
+        state.track_file("/tracked.txt", 100, "content")
+        state.mark_instruction_content_appended("/folder")
+
+        with patch("session_state.sys.intern", wraps=sys.intern) as intern_mock:
+            self.assertTrue(state.has_appended_instruction_content("".join(["/fol", "der"])))
+            self.assertFalse(state.has_appended_instruction_content("/never/seen"))
+            state.untrack_file("".join(["/tracked", ".txt"]))
+            state.untrack_file("/never/tracked.txt")
+
+        intern_mock.assert_not_called()
+        self.assertEqual(state.files_tracked, 0)
+
+    def test_is_unchanged_compares_mtime_and_size(self) -> None:
+        """Verify is_unchanged checks both mtime and the recorded size."""
+        from session_state import SessionState
+
+        state = SessionState()
+        state.track_file("/sized.txt", 100, "content", 7)
+        state.track_file("/unsized.txt", 100, "content")
+
+        self.assertTrue(state.is_unchanged("/sized.txt", 100, 7))
+        self.assertFalse(state.is_unchanged("/sized.txt", 100, 8))
+        self.assertFalse(state.is_unchanged("/sized.txt", 101, 7))
+        self.assertTrue(state.is_unchanged("/unsized.txt", 100, 8))
+        self.assertFalse(state.is_unchanged("/untracked.txt", 100, 7))
+
+    def test_contents_are_bounded_least_recently_used_first(self) -> None:
+        """Verify old contents are evicted while their files stay tracked."""
+        from unittest.mock import patch
+
+        import session_state
+        from session_state import SessionState
+
+        state = SessionState()
+        with patch.object(session_state, "_MAX_CACHED_CONTENTS", 2):
+            state.track_file("/a.txt", 1, "a")
+            state.track_file("/b.txt", 2, "b")
+            state.remember_content("/a.txt", "a2")
+            state.track_file("/c.txt", 3, "c")
+
+        self.assertEqual(list(state.contents), ["/a.txt", "/c.txt"])
+        self.assertEqual(state.contents["/a.txt"], "a2")
+        self.assertIn("/b.txt", state.mtimes)
+        self.assertEqual(list(state.content_hashes), ["/b.txt"])
+        self.assertTrue(state.has_same_content("/b.txt", "b"))
+        self.assertFalse(state.has_same_content("/b.txt", "changed"))
+        self.assertTrue(state.has_same_content("/a.txt", "a2"))
+
     def test_untrack_nonexistent_file_does_not_raise(self) -> None:
         """Verify untracking non-existent file is safe."""
         from session_state import SessionState
@@ -147,6 +213,28 @@ class TestNewSessionCooldown(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(len(state.mtimes), 0)
 
+    def test_concurrent_try_new_session_clears_once(self) -> None:
+        """Verify a burst of concurrent calls performs a single clear."""
+        import threading
+        from session_state import SessionState
+
+        state = SessionState()
+        barrier = threading.Barrier(8)
+        results: list[bool] = []
+
+        def attempt() -> None:
+            barrier.wait()
+            results.append(state.try_new_session())
+
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(state.new_session_clear_count, 1)
+
 
 class TestNewSessionClearCount(unittest.TestCase):
     """Tests for new_session_clear_count tracking and base instruction file inclusion."""
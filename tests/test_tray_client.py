@@ -416,3 +416,114 @@ class TestSessionStoreInterruptOnRegister:
             }
         )
         assert store.get("s1").interrupted is True
+
+
+class TestToolCallMessage:
+    """log_tool_call sends one combined message per tool call."""
+
+    def _install_fake_client(self, monkeypatch):
+        import tray_client
+
+        client = TrayClient("C:\\test")
+        client._connected = True
+        sent = []
+        client.send_message = sent.append
+        monkeypatch.setattr(tray_client, "_tray_client", client)
+        monkeypatch.setattr(tray_client, "_client_name_sent", False)
+        monkeypatch.setattr(tray_client, "_files_tracked_sent", None)
+        monkeypatch.setattr(tray_client, "_known_generation", 0)
+        return client, sent
+
+    def test_files_tracked_only_included_when_changed(self, monkeypatch):
+        from tray_client import log_tool_call
+
+        _, sent = self._install_fake_client(monkeypatch)
+        log_tool_call("read", files_tracked=3, file_path="a.py")
+        log_tool_call("read", files_tracked=3, file_path="b.py")
+        log_tool_call("read", files_tracked=4, file_path="c.py")
+        assert len(sent) == 3
+        assert [msg.get("files_tracked") for msg in sent] == [3, None, 4]
+        assert all(msg["type"] == "tool_call" for msg in sent)
+
+    def test_client_name_rides_along_once(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from tray_client import log_tool_call
+
+        _, sent = self._install_fake_client(monkeypatch)
+        client_info = SimpleNamespace(name="VS Code")
+        ctx = SimpleNamespace(
+            session=SimpleNamespace(client_params=SimpleNamespace(clientInfo=client_info))
+        )
+        log_tool_call("list", ctx=ctx, path="")
+        log_tool_call("list", ctx=ctx, path="")
+        assert sent[0]["client_name"] == "VS Code"
+        assert "client_name" not in sent[1]
+
+    def test_files_tracked_resent_after_reconnect(self, monkeypatch):
+        from tray_client import log_tool_call
+
+        client, sent = self._install_fake_client(monkeypatch)
+        log_tool_call("read", files_tracked=3, file_path="a.py")
+        client._connection_generation += 1
+        log_tool_call("read", files_tracked=3, file_path="a.py")
+        assert [msg.get("files_tracked") for msg in sent] == [3, 3]
+
+    def test_nowait_sends_in_background_in_order(self, monkeypatch):
+        import tray_client
+        from tray_client import log_tool_call_nowait
+
+        _, sent = self._install_fake_client(monkeypatch)
+        log_tool_call_nowait("read", files_tracked=1, file_path="a.py")
+        log_tool_call_nowait("read", files_tracked=2, file_path="b.py")
+        done = threading.Event()
+        tray_client._send_queue.put(done.set)
+        assert done.wait(timeout=5)
+        assert [msg["summary"] for msg in sent] == ["read: a.py", "read: b.py"]
+
+    def test_nowait_is_noop_without_tray(self, monkeypatch):
+        import tray_client
+        from tray_client import log_tool_call_nowait
+
+        monkeypatch.setattr(tray_client, "_tray_client", None)
+        monkeypatch.setattr(tray_client, "_send_queue", None)
+        log_tool_call_nowait("read", file_path="a.py")
+        assert tray_client._send_queue is None
+
+    def test_nowait_worker_is_daemon_thread(self, monkeypatch):
+        import tray_client
+        from tray_client import log_tool_call_nowait
+        self._install_fake_client(monkeypatch)
+        monkeypatch.setattr(tray_client, "_send_queue", None)
+        log_tool_call_nowait("read", file_path="a.py")
+        workers = [t for t in threading.enumerate() if t.name == "lineage-tray"]
+        assert workers and all(t.daemon for t in workers)
+
+
+class TestTrayAvailable:
+    """tray_available is a cheap pre-check before logging tool calls."""
+
+    def test_false_without_client(self, monkeypatch):
+        import tray_client
+
+        monkeypatch.setattr(tray_client, "_tray_client", None)
+        assert tray_client.tray_available() is False
+
+    def test_true_when_connected(self, monkeypatch):
+        import tray_client
+
+        client = TrayClient("C:\\test")
+        client._connected = True
+        monkeypatch.setattr(tray_client, "_tray_client", client)
+        assert tray_client.tray_available() is True
+
+    def test_disconnected_waits_for_reconnect_interval(self, monkeypatch):
+        import tray_client
+
+        client = TrayClient("C:\\test")
+        client._last_reconnect_attempt = time.monotonic()
+        monkeypatch.setattr(tray_client, "_tray_client", client)
+        assert tray_client.tray_available() is False
+
+        client._last_reconnect_attempt -= client._reconnect_interval
+        assert tray_client.tray_available() is True
@@ -6,9 +6,18 @@ This module provides common test utilities used across all test modules.
 from __future__ import annotations
 
 import asyncio
+import atexit
+import itertools
+import os
+import shutil
 import sys
 import tempfile
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from session_state import SessionState
 
 # Add parent directory to path for module imports
 _parent_dir = str(Path(__file__).parent.parent)
@@ -16,11 +25,28 @@ if _parent_dir not in sys.path:
     sys.path.insert(0, _parent_dir)
 
 
+def _workspace_parent() -> str | None:
+    """Return /dev/shm when it is usable (Linux tmpfs), else None for the default temp dir."""
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+# One temporary root per test process; each workspace is a plain mkdir inside it.
+# Resolved once here (e.g. /var -> /private/var on macOS) so workspace paths,
+# the patched base dir, and paths returned by create_file are all canonical.
+_WORKSPACE_ROOT = Path(tempfile.mkdtemp(prefix="lineage-tests-", dir=_workspace_parent())).resolve()
+atexit.register(shutil.rmtree, _WORKSPACE_ROOT, ignore_errors=True)
+_workspace_ids = itertools.count()
+
+
 class TempWorkspace:
     """Context manager for creating isolated test workspaces.
     
-    Creates a temporary directory and patches path_utils._base_dir
-    to point to it, ensuring all path operations are sandboxed.
+    Creates a fresh directory under the per-process temporary root and
+    patches path_utils._base_dir to point to it, ensuring all path
+    operations are sandboxed.
     
     Usage:
         with TempWorkspace() as ws:
@@ -29,15 +55,14 @@ class TempWorkspace:
     """
 
     def __init__(self) -> None:
-        self.tmpdir: tempfile.TemporaryDirectory[str] | None = None
         self.path: Path = Path()
         self.old_base_dir: Path = Path()
 
     def __enter__(self) -> "TempWorkspace":
         import path_utils
 
-        self.tmpdir = tempfile.TemporaryDirectory()
-        self.path = Path(self.tmpdir.name)
+        self.path = _WORKSPACE_ROOT / f"ws-{next(_workspace_ids)}"
+        self.path.mkdir()
         self.old_base_dir = path_utils._base_dir
         path_utils._base_dir = self.path
         return self
@@ -46,8 +71,7 @@ class TempWorkspace:
         import path_utils
 
         path_utils._base_dir = self.old_base_dir
-        if self.tmpdir:
-            self.tmpdir.cleanup()
+        shutil.rmtree(self.path, ignore_errors=True)
 
     def create_file(self, relative_path: str, content: str = "") -> Path:
         """Create a file in the workspace.
@@ -78,10 +102,50 @@ class TempWorkspace:
         return dir_path
 
 
+@contextmanager
+def session_at(clear_count: int) -> Iterator[SessionState]:
+    """Run a block with the session at a given cache clear count.
+
+    Sets new_session_clear_count and starts with no appended instruction
+    folders; both are restored on exit.
+
+    Args:
+        clear_count: Value for session.new_session_clear_count inside the block
+
+    Yields:
+        The session singleton
+    """
+    from session_state import session
+
+    old_count = session.new_session_clear_count
+    old_folders = set(session.appended_instruction_folders)
+    session.new_session_clear_count = clear_count
+    session.appended_instruction_folders.clear()
+    try:
+        yield session
+    finally:
+        session.new_session_clear_count = old_count
+        session.appended_instruction_folders.clear()
+        session.appended_instruction_folders.update(old_folders)
+
+
+# Event loop shared by every run_async call in this process
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _close_loop() -> None:
+    if _loop is not None and not _loop.is_closed():
+        _loop.close()
+
+
+atexit.register(_close_loop)
+
+
 def run_async(coroutine: object) -> object:
     """Run an async function synchronously for testing.
     
-    Handles event loop creation properly to avoid deprecation warnings.
+    Reuses one event loop for the whole test process instead of creating
+    a new one per call; it is closed at exit.
     
     Args:
         coroutine: Coroutine to execute
@@ -89,9 +153,7 @@ def run_async(coroutine: object) -> object:
     Returns:
         Result of the coroutine
     """
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(coroutine)  # type: ignore
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coroutine)  # type: ignore
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal, TypedDict
 
 from file_watcher import format_changed_files_section
-from path_utils import get_base_dir, get_file_mtime_ms, resolve_path
+from path_utils import get_base_dir, resolve_path, stat_mtime_ms
 from session_state import session
 
 
@@ -27,7 +28,7 @@ class ModifyOperation(TypedDict, total=False):
     occurrence: OccurrenceMode
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationResult:
     success: bool
     message: str
@@ -52,14 +53,12 @@ async def modify(
     if on_error not in ("abort", "continue"):
         return f"Error: invalid 'on_error'. {_tool_usage()}"
 
-    results: list[str] = []
-
-    for index, operation in enumerate(operations, 1):
-        result = _apply_operation(index, operation)
-        results.append(result.message)
-
-        if not result.success and on_error == "abort":
-            break
+    results = [
+        result.message
+        for result in _apply_operations(
+            list(enumerate(operations, 1)), stop_on_error=on_error == "abort"
+        )
+    ]
 
     output = "\n".join(results)
     changed_section = format_changed_files_section()
@@ -88,7 +87,55 @@ def _operation_usage(operation_type: str | None = None) -> str:
     )
 
 
-def _apply_operation(index: int, operation: ModifyOperation) -> OperationResult:
+def _apply_operations(
+    operations: list[tuple[int, ModifyOperation]],
+    stop_on_error: bool,
+) -> list[OperationResult]:
+    """Apply numbered operations in order, returning one result per operation attempted.
+
+    Consecutive append and replace operations on the same file are handed to
+    _edit_file together, so the run costs one read and one write instead of
+    one of each per operation. Stops after the first failure when
+    stop_on_error is set.
+    """
+    targets = [_resolve_operation(index, operation) for index, operation in operations]
+    results: list[OperationResult] = []
+    position = 0
+    while position < len(operations):
+        index, operation = operations[position]
+        target = targets[position]
+        end = position + 1
+
+        if isinstance(target, OperationResult):
+            batch = [target]
+        elif operation["operation"] == "create":
+            batch = [_create_file(index, operation["file_path"], target, operation["text"])]
+        elif operation["operation"] == "overwrite":
+            batch = [_overwrite_file(index, operation["file_path"], target, operation["text"])]
+        else:
+            while (
+                end < len(operations)
+                and isinstance(targets[end], Path)
+                and targets[end] == target
+                and operations[end][1]["operation"] in ("append", "replace")
+            ):
+                end += 1
+            batch = _edit_file(operations[position:end], target, stop_on_error)
+
+        results.extend(batch)
+        if stop_on_error and not batch[-1].success:
+            break
+        position = end
+
+    return results
+
+
+def _resolve_operation(index: int, operation: ModifyOperation) -> Path | OperationResult:
+    """Validate an operation and resolve its target path.
+
+    Returns:
+        The resolved path, or a failed OperationResult describing the problem.
+    """
     file_path = operation.get("file_path")
     operation_type = operation.get("operation")
     text = operation.get("text")
@@ -138,16 +185,7 @@ def _apply_operation(index: int, operation: ModifyOperation) -> OperationResult:
     if not path_result.success:
         return OperationResult(False, f"Operation {index} ({file_path}): {path_result.error}")
 
-    full_path = path_result.path
-
-    if operation_type == "create":
-        return _create_file(index, file_path, full_path, text)
-    if operation_type == "overwrite":
-        return _overwrite_file(index, file_path, full_path, text)
-    if operation_type == "append":
-        return _append_file(index, file_path, full_path, text)
-
-    return _replace_in_file(index, file_path, full_path, text, match_text, occurrence)
+    return path_result.path
 
 
 def _create_file(index: int, file_path: str, full_path: Path, text: str) -> OperationResult:
@@ -173,83 +211,112 @@ def _overwrite_file(index: int, file_path: str, full_path: Path, text: str) -> O
         return OperationResult(False, f"Operation {index} ({file_path}): Error writing file: {exc}")
 
 
-def _append_file(index: int, file_path: str, full_path: Path, text: str) -> OperationResult:
-    if not full_path.exists():
-        return OperationResult(
-            False,
-            f"Operation {index} ({file_path}): Error: File not found (base directory: {get_base_dir()})",
-        )
-    if not full_path.is_file():
-        return OperationResult(
-            False,
-            f"Operation {index} ({file_path}): Error: Path is not a file (base directory: {get_base_dir()})",
-        )
-
-    try:
-        existing = full_path.read_text(encoding="utf-8")
-        new_content = existing + text
-        full_path.write_text(new_content, encoding="utf-8")
-        _track_file(full_path, new_content)
-        return OperationResult(
-            True,
-            f"Operation {index} ({file_path}): Successfully appended {len(text)} character(s)",
-        )
-    except (OSError, UnicodeDecodeError) as exc:
-        return OperationResult(False, f"Operation {index} ({file_path}): Error processing file: {exc}")
-
-
-def _replace_in_file(
-    index: int,
-    file_path: str,
+def _edit_file(
+    edits: list[tuple[int, ModifyOperation]],
     full_path: Path,
-    text: str,
-    match_text: str,
-    occurrence: OccurrenceMode,
-) -> OperationResult:
+    stop_on_error: bool,
+) -> list[OperationResult]:
+    """Apply append and replace operations to one file with a single read and write.
+
+    Edits are applied in order to the content in memory; an edit that fails
+    leaves it unchanged for the next one. The file is written once at the end
+    if any edit succeeded, and if that write fails every applied edit reports
+    the write error instead.
+    """
+    error: str | None = None
     if not full_path.exists():
-        return OperationResult(
-            False,
-            f"Operation {index} ({file_path}): Error: File not found (base directory: {get_base_dir()})",
-        )
-    if not full_path.is_file():
-        return OperationResult(
-            False,
-            f"Operation {index} ({file_path}): Error: Path is not a file (base directory: {get_base_dir()})",
-        )
-
-    try:
-        content = full_path.read_text(encoding="utf-8")
-    except (OSError, UnicodeDecodeError) as exc:
-        return OperationResult(False, f"Operation {index} ({file_path}): Error reading file: {exc}")
-
-    count = content.count(match_text)
-    if count == 0:
-        return OperationResult(False, f"Operation {index} ({file_path}): Error: String not found in file")
-
-    if occurrence == "one" and count != 1:
-        return OperationResult(
-            False,
-            f"Operation {index} ({file_path}): Error: String found {count} times. Use occurrence='all' or make the string more specific.",
-        )
-
-    if occurrence == "all":
-        new_content = content.replace(match_text, text)
-        replaced = count
+        error = f"Error: File not found (base directory: {get_base_dir()})"
+    elif not full_path.is_file():
+        error = f"Error: Path is not a file (base directory: {get_base_dir()})"
     else:
-        new_content = content.replace(match_text, text, 1)
-        replaced = 1
+        try:
+            content = full_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as exc:
+            error = f"Error reading file: {exc}"
+
+    if error is not None:
+        failed = edits[:1] if stop_on_error else edits
+        return [
+            OperationResult(False, f"Operation {index} ({operation['file_path']}): {error}")
+            for index, operation in failed
+        ]
+
+    results: list[OperationResult] = []
+    applied: list[int] = []
+    for index, operation in edits:
+        prefix = f"Operation {index} ({operation['file_path']})"
+        text = operation["text"]
+
+        if operation["operation"] == "append":
+            content += text
+            result = OperationResult(True, f"{prefix}: Successfully appended {len(text)} character(s)")
+        else:
+            replace_all = operation.get("occurrence", "one") == "all"
+            new_content, count = _find_and_replace(content, operation["match_text"], text, replace_all)
+            if count == 0:
+                result = OperationResult(False, f"{prefix}: Error: String not found in file")
+            elif new_content is None:
+                result = OperationResult(
+                    False,
+                    f"{prefix}: Error: String found {count} times. Use occurrence='all' or make the string more specific.",
+                )
+            else:
+                content = new_content
+                result = OperationResult(True, f"{prefix}: Successfully replaced {count} occurrence(s)")
+
+        if result.success:
+            applied.append(len(results))
+        results.append(result)
+        if not result.success and stop_on_error:
+            break
 
-    try:
-        full_path.write_text(new_content, encoding="utf-8")
-        _track_file(full_path, new_content)
-        return OperationResult(
-            True,
-            f"Operation {index} ({file_path}): Successfully replaced {replaced} occurrence(s)",
-        )
-    except OSError as exc:
-        return OperationResult(False, f"Operation {index} ({file_path}): Error writing file: {exc}")
+    if applied:
+        try:
+            full_path.write_text(content, encoding="utf-8")
+            _track_file(full_path, content)
+        except OSError as exc:
+            for position in applied:
+                index, operation = edits[position]
+                results[position] = OperationResult(
+                    False,
+                    f"Operation {index} ({operation['file_path']}): Error writing file: {exc}",
+                )
+
+    return results
+
+
+def _find_and_replace(content: str, match_text: str, text: str, replace_all: bool) -> tuple[str | None, int]:
+    """Replace match_text in content, scanning the content as few times as possible.
+
+    A single replacement is found with str.find and spliced in directly, so
+    the common unique-match case scans up to the match, then checks the rest
+    for a second one, instead of counting and then searching again to replace.
+
+    Returns:
+        (new_content, count), where count is how many times match_text occurs.
+        new_content is None when nothing was replaced: no match, or more than
+        one match without replace_all.
+    """
+    if replace_all:
+        count = content.count(match_text)
+        if count == 0:
+            return None, 0
+        return content.replace(match_text, text), count
+
+    first = content.find(match_text)
+    if first < 0:
+        return None, 0
+    end = first + len(match_text)
+    # max() keeps an empty match_text from finding itself again at the same spot
+    second = content.find(match_text, max(end, first + 1))
+    if second < 0:
+        return content[:first] + text + content[end:], 1
+    # Ambiguous: the error reports the exact count, but the text before the
+    # second match has already been scanned, so only count what follows it
+    return None, 2 + content.count(match_text, max(second + len(match_text), second + 1))
 
 
 def _track_file(full_path: Path, content: str) -> None:
-    mtime = get_file_mtime_ms(full_path)
-    session.track_file(str(full_path), mtime, content)
+    file_path_str = str(full_path)
+    file_stat = os.stat(file_path_str)
+    session.track_file(file_path_str, stat_mtime_ms(file_stat), content, file_stat.st_size)
@@ -1,6 +1,10 @@
 """Read file tool - file content reading with cursor-based pagination."""
 
+import bisect
+import itertools
 import math
+import os
+import stat
 
 from config import READ_CHAR_LIMIT
 from file_watcher import format_changed_files_section
@@ -9,15 +13,23 @@ from instruction_files import (
     include_instruction_file_content,
     mark_instruction_content_appended_if_applicable,
 )
-from path_utils import get_base_dir, get_file_mtime_ms, resolve_path
+from path_utils import get_base_dir, resolve_path, stat_mtime_ms
 from session_state import session
 
+# Flags for opening a file before its type is known. O_NONBLOCK (POSIX only)
+# makes opening a FIFO return at once instead of waiting for a writer, so
+# read_file's fstat check can reject it; it has no effect on regular files.
+# O_BINARY (Windows only) keeps the C runtime from opening the descriptor in
+# text mode, where a 0x1A byte reads as end of file.
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+
 
 def extract_content_by_cursor(
     content: str,
     cursor: int,
     budget: int,
     show_line_numbers: bool = False,
+    lines: list[str] | None = None,
 ) -> tuple[str, int, int, int, int]:
     """Extract content from a character cursor position within a budget.
 
@@ -29,6 +41,7 @@ def extract_content_by_cursor(
         cursor: Character offset to start from (0-indexed)
         budget: Maximum characters for the extracted content (including line number prefixes)
         show_line_numbers: If True, account for line number prefix cost in budget
+        lines: Optional content.splitlines(keepends=True), if the caller already has it
 
     Returns:
         Tuple of:
@@ -41,15 +54,12 @@ def extract_content_by_cursor(
     if not content:
         return "", 0, 0, 0, 0
 
-    lines = content.splitlines(keepends=True)
+    if lines is None:
+        lines = content.splitlines(keepends=True)
     total_lines = len(lines)
 
     # Build cumulative character positions
-    line_boundaries: list[int] = []
-    cumulative = 0
-    for line in lines:
-        cumulative += len(line)
-        line_boundaries.append(cumulative)
+    line_boundaries = list(itertools.accumulate(map(len, lines)))
 
     total_chars = line_boundaries[-1] if line_boundaries else 0
 
@@ -57,54 +67,39 @@ def extract_content_by_cursor(
     if cursor >= total_chars:
         return "", total_chars, total_lines, total_lines, total_lines
 
-    # Find which line the cursor falls in
+    # Find which line the cursor falls in (first boundary past the cursor)
     # Snap cursor to the start of its containing line
-    start_line = 0
-    for i, boundary in enumerate(line_boundaries):
-        if cursor < boundary:
-            start_line = i
-            break
+    start_line = bisect.bisect_right(line_boundaries, cursor)
     # Actual start position (beginning of the start_line)
     actual_start = line_boundaries[start_line - 1] if start_line > 0 else 0
 
-    # Accumulate lines within budget
-    accumulated = 0
-    end_line = start_line
-    formatted_parts: list[str] = []
-
-    for i in range(start_line, total_lines):
-        line = lines[i]
-        line_content = line.rstrip("\n\r")
-
-        if show_line_numbers:
-            line_num = i + 1  # 1-indexed
-            prefix = f"{line_num}→"
-            display_line = f"{prefix}{line_content}"
+    if not show_line_numbers:
+        # Cost is the raw line length (including its original newline), so the
+        # last line that fits is found directly on the cumulative boundaries
+        # (always including at least one line).
+        end_line = max(start_line + 1, bisect.bisect_right(line_boundaries, actual_start + budget))
+        extracted = content[actual_start:line_boundaries[end_line - 1]]
+    else:
+        # Accumulate numbered lines within budget
+        accumulated = 0
+        end_line = start_line
+        formatted_parts: list[str] = []
+
+        for i in range(start_line, total_lines):
+            line_content = lines[i].rstrip("\n\r")
+            display_line = f"{i + 1}→{line_content}"  # 1-indexed
             line_cost = len(display_line) + 1  # +1 for the joining newline
-        else:
-            display_line = line_content
-            # Cost is the raw line length (including its original newline)
-            line_cost = len(line)
 
-        # Check if adding this line would exceed the budget
-        if accumulated + line_cost > budget and accumulated > 0:
-            # Stop before this line (but always include at least one line)
-            break
+            # Check if adding this line would exceed the budget
+            if accumulated + line_cost > budget and accumulated > 0:
+                # Stop before this line (but always include at least one line)
+                break
 
-        if show_line_numbers:
             formatted_parts.append(display_line)
             accumulated += line_cost
-        else:
-            accumulated += line_cost
-
-        end_line = i + 1  # exclusive
+            end_line = i + 1  # exclusive
 
-    # Build extracted content
-    if show_line_numbers:
         extracted = "\n".join(formatted_parts)
-    else:
-        actual_end = line_boundaries[end_line - 1] if end_line > 0 else 0
-        extracted = content[actual_start:actual_end]
 
     # Next cursor is the char position after the last included line
     next_cursor = line_boundaries[end_line - 1] if end_line > 0 else 0
@@ -112,6 +107,39 @@ def extract_content_by_cursor(
     return extracted, next_cursor, start_line, end_line, total_lines
 
 
+def _read_text(fd: int, size: int) -> str:
+    """Read an open file to the end and decode it as UTF-8 text.
+
+    Gives the same result as open(path, encoding="utf-8").read(), including
+    universal newline translation, so read content matches what the change
+    detector and modify() read. The file is read with one os.read sized
+    from fstat and decoded in one pass, without a buffered text wrapper.
+
+    Args:
+        fd: Open file descriptor, positioned at the start of the file.
+        size: File size in bytes from fstat on the descriptor.
+
+    Returns:
+        The decoded file content.
+
+    Raises:
+        OSError: If reading fails.
+        UnicodeDecodeError: If the content is not valid UTF-8.
+    """
+    data = os.read(fd, size + 1)
+    if len(data) != size:
+        # The file changed size since fstat or the read came back short
+        chunks = [data]
+        while chunk := os.read(fd, 1 << 16):
+            chunks.append(chunk)
+        data = b"".join(chunks)
+
+    content = data.decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
 async def read_file(
     file_path: str,
     show_line_numbers: bool = False,
@@ -167,15 +195,26 @@ async def read_file(
         return result.error
 
     full_path = result.path
-    if not full_path.exists():
-        return f"Error: File not found: {file_path} (base directory: {get_base_dir()})"
-    if not full_path.is_file():
-        return f"Error: Path is not a file: {file_path} (base directory: {get_base_dir()})"
 
-    # Read full file content once
+    # Read full file content once. Opening first and taking the type and mtime
+    # from fstat on the open descriptor replaces separate exists/is_file/stat calls.
     try:
-        full_content = full_path.read_text(encoding="utf-8")
-    except (OSError, UnicodeDecodeError) as e:
+        fd = os.open(full_path, _OPEN_FLAGS)
+        try:
+            file_stat = os.fstat(fd)
+            if not stat.S_ISREG(file_stat.st_mode):
+                return f"Error: Path is not a file: {file_path} (base directory: {get_base_dir()})"
+            full_content = _read_text(fd, file_stat.st_size)
+        finally:
+            os.close(fd)
+    except FileNotFoundError:
+        return f"Error: File not found: {file_path} (base directory: {get_base_dir()})"
+    except OSError as e:
+        # Opening a directory fails (IsADirectoryError, or PermissionError on Windows)
+        if full_path.is_dir():
+            return f"Error: Path is not a file: {file_path} (base directory: {get_base_dir()})"
+        return f"Error reading file: {e}"
+    except UnicodeDecodeError as e:
         return f"Error reading file: {e}"
 
     lines = full_content.splitlines(keepends=True)
@@ -184,8 +223,8 @@ async def read_file(
 
     # Track file for change detection (always track full content)
     file_path_str = str(full_path)
-    mtime = get_file_mtime_ms(full_path)
-    session.track_file(file_path_str, mtime, full_content)
+    mtime = stat_mtime_ms(file_stat)
+    session.track_file(file_path_str, mtime, full_content, file_stat.st_size)
 
     # Mark instruction folder if this is an instruction file read directly
     mark_instruction_content_appended_if_applicable(full_path)
@@ -288,7 +327,7 @@ async def read_file(
 
         # Extract content within budget
         extracted, next_cursor, start_line, end_line, _ = extract_content_by_cursor(
-            full_content, cursor, content_budget, show_line_numbers
+            full_content, cursor, content_budget, show_line_numbers, lines
         )
 
         is_last = next_cursor >= total_chars
@@ -314,7 +353,7 @@ async def read_file(
             header += f"[Lineage: file not complete - you MUST call read again with cursor={next_cursor} to get the rest]\n"
         header += "\n"
 
-        output = header + extracted
+        body = extracted
 
         # Build continuation/EOF footer (appended AFTER overhead so it's the last thing)
         if not is_last:
@@ -352,13 +391,10 @@ async def read_file(
                 formatted_lines.append(f"{line_num}→{line_content}")
             content = "\n".join(formatted_lines)
 
-        output = content
+        header = ""
+        body = content
         continuation = ""
 
-    # Append pre-generated overhead
-    output += overhead
-
-    # Append continuation/EOF message last (so it's the final thing the LLM sees)
-    output += continuation
-
-    return output
+    # Assemble in one allocation: header, content, pre-generated overhead, then
+    # the continuation/EOF message last (so it's the final thing the LLM sees)
+    return f"{header}{body}{overhead}{continuation}"
@@ -1,12 +1,113 @@
 """Search files tool - glob pattern file search."""
 
 import asyncio
+import fnmatch
+import os
+import re
+import sys
 from pathlib import Path
+from typing import Iterator
 
 from file_watcher import format_changed_files_section
 from path_utils import get_allow_full_paths, get_base_dir, resolve_path
 
 
+_WILDCARD_CHARS = ("*", "?", "[")
+_SEGMENT_FLAGS = re.IGNORECASE if sys.platform == "win32" else 0
+
+
+def _split_pattern(pattern: str) -> list[str] | None:
+    """Split a relative glob pattern into path segments.
+
+    Returns None for patterns the scandir walker does not handle (absolute
+    paths, parent references, partial ``**`` segments, a trailing slash,
+    which makes Path.glob match directories only, and a trailing ``**``,
+    which matches files too from Python 3.13); those fall back to Path.glob
+    so their behaviour and errors stay exactly as before.
+    """
+    if sys.platform == "win32":
+        pattern = pattern.replace("\\", "/")
+    if pattern.startswith("/") or pattern.endswith("/") or (sys.platform == "win32" and ":" in pattern):
+        return None
+    segments = [segment for segment in pattern.split("/") if segment not in ("", ".")]
+    if not segments or segments[-1] == "**":
+        return None
+    for segment in segments:
+        if segment == ".." or ("**" in segment and segment != "**"):
+            return None
+    return segments
+
+
+def _compile_segment(segment: str) -> re.Pattern | None:
+    """Compile a wildcard segment to a regex, or None for a literal name."""
+    if segment == "**" or not any(char in segment for char in _WILDCARD_CHARS):
+        return None
+    return re.compile(fnmatch.translate(segment), _SEGMENT_FLAGS)
+
+
+def _scandir_glob(root: str, segments: list[str]) -> Iterator[tuple[str, bool]]:
+    """Match glob segments below root using os.scandir.
+
+    Mirrors Path.glob for segments from _split_pattern, whose last segment
+    is never ``**``: ``**`` matches zero or more directories without
+    descending into symlinked ones, and only the last segment may match
+    files. Names are filtered before any Path is built, and directory
+    checks use the DirEntry type rather than a separate stat call.
+
+    Yields:
+        (path, via_symlink) pairs, where via_symlink is True when the match
+        is or sits below a symlink and so may point outside root.
+    """
+    patterns = [_compile_segment(segment) for segment in segments]
+    last = len(segments) - 1
+
+    def walk_dirs(dir_path: str) -> Iterator[str]:
+        yield dir_path
+        try:
+            with os.scandir(dir_path) as entries:
+                subdirs = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for subdir in subdirs:
+            yield from walk_dirs(subdir)
+
+    def select(dir_path: str, index: int, via_symlink: bool) -> Iterator[tuple[str, bool]]:
+        segment = segments[index]
+
+        if segment == "**":
+            # Never the last segment; _split_pattern leaves that to Path.glob
+            for sub_path in walk_dirs(dir_path):
+                yield from select(sub_path, index + 1, via_symlink)
+            return
+
+        pattern = patterns[index]
+        if pattern is None:
+            child = os.path.join(dir_path, segment)
+            if index == last:
+                if os.path.exists(child):
+                    yield child, via_symlink or os.path.islink(child)
+            elif os.path.isdir(child):
+                yield from select(child, index + 1, via_symlink or os.path.islink(child))
+            return
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = [entry for entry in it if pattern.match(entry.name)]
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if index == last:
+                    yield entry.path, via_symlink or entry.is_symlink()
+                elif entry.is_dir():
+                    yield from select(entry.path, index + 1, via_symlink or entry.is_symlink())
+            except OSError:
+                continue
+
+    # ``**`` segments can reach the same path more than once; keep the first.
+    yield from dict(select(root, 0, False)).items()
+
+
 async def search_files(pattern: str, path: str = "") -> str:
     """Search for files matching a glob pattern.
 
@@ -30,15 +131,25 @@ async def search_files(pattern: str, path: str = "") -> str:
 
     # Perform glob search in a thread pool to avoid blocking
     def do_glob():
-        matches: list[Path] = []
-        for match in search_dir.glob(pattern):
-            resolved = match.resolve()
+        allow_full_paths = get_allow_full_paths()
+        resolved_base = base_dir.resolve()
+
+        def is_allowed(match: Path) -> bool:
             # Security: only allow results outside base_dir when allowFullPaths is enabled
-            if not get_allow_full_paths():
-                try:
-                    resolved.relative_to(base_dir.resolve())
-                except ValueError:
-                    continue
+            return allow_full_paths or match.resolve().is_relative_to(resolved_base)
+
+        segments = _split_pattern(pattern)
+        if segments is None:
+            return [match for match in search_dir.glob(pattern) if is_allowed(match)]
+
+        # search_dir is already resolved, so matches reached without a symlink
+        # stay inside it and only symlinked matches need resolving.
+        search_dir_allowed = is_allowed(search_dir)
+        matches: list[Path] = []
+        for match_path, via_symlink in _scandir_glob(str(search_dir), segments):
+            match = Path(match_path)
+            if (via_symlink or not search_dir_allowed) and not is_allowed(match):
+                continue
             matches.append(match)
         return matches
 
@@ -8,13 +8,16 @@ are silently ignored to avoid impacting the core MCP server.
 """
 
 import atexit
+import functools
 import os
+import queue
 import subprocess
 import sys
 import threading
 import time
 from multiprocessing.connection import Client
 from pathlib import Path
+from typing import Callable
 
 from hooks.pid_utils import get_ancestor_chain
 
@@ -384,7 +387,11 @@ def ensure_tray_running() -> bool:
 _tray_client: TrayClient | None = None
 _first_call_sent = False
 _client_name_sent = False
+_files_tracked_sent: int | None = None
 _known_generation: int = 0
+# Pending tray sends for the background worker, created on first use
+_send_queue: queue.SimpleQueue[Callable[[], None]] | None = None
+_send_queue_lock = threading.Lock()
 
 
 def _extract_client_name(ctx: object | None) -> str | None:
@@ -406,14 +413,23 @@ def _extract_client_name(ctx: object | None) -> str | None:
     return None
 
 
-def log_tool_call(tool_name: str, *, ctx: object | None = None, **kwargs) -> None:
-    """Log a tool call with full parameters to the tray.
+def log_tool_call(
+    tool_name: str,
+    *,
+    ctx: object | None = None,
+    files_tracked: int | None = None,
+    **kwargs,
+) -> None:
+    """Log a completed tool call with full parameters to the tray.
 
-    Also sends the client name (once per session) if ctx is provided.
+    Sends a single message per call. The client name (once per session)
+    and the tracked file count (when it changed) ride along with the
+    tool call instead of going out as separate updates.
 
     Args:
         tool_name: Name of the tool (e.g. 'read', 'modify', 'delete')
         ctx: Optional MCP Context for client name extraction.
+        files_tracked: Number of files tracked after the call, if known.
         **kwargs: Tool arguments (file_path, pattern, content, offset, limit, etc.)
     """
     if _tray_client is None:
@@ -425,21 +441,83 @@ def log_tool_call(tool_name: str, *, ctx: object | None = None, **kwargs) -> Non
         return
 
     try:
-        # Send client name update (once per session)
-        if ctx is not None:
-            client_name = _extract_client_name(ctx)
-            update_tray_client_name(client_name)
+        _reset_sent_flags_on_reconnect()
 
-        formatted_call = format_tool_call(tool_name, **kwargs)
-        _tray_client.send_message({
+        msg = {
             "type": "tool_call",
             "tool": tool_name,
-            "summary": formatted_call,
-        })
+            "summary": format_tool_call(tool_name, **kwargs),
+        }
+
+        global _client_name_sent, _files_tracked_sent
+        client_name = _extract_client_name(ctx) if ctx is not None else None
+        if not _client_name_sent and client_name:
+            _client_name_sent = True
+            msg["client_name"] = client_name
+        if files_tracked is not None and files_tracked != _files_tracked_sent:
+            _files_tracked_sent = files_tracked
+            msg["files_tracked"] = files_tracked
+
+        _tray_client.send_message(msg)
     except Exception:
         pass  # Tray logging is best-effort
 
 
+def tray_available() -> bool:
+    """Cheap check for whether a tray message could be sent right now.
+
+    True when connected, or when disconnected but a rate-limited reconnect
+    attempt is due. Lets callers skip building log arguments when the tray
+    is not running.
+
+    Returns:
+        True if logging a tool call is worthwhile, False otherwise.
+    """
+    client = _tray_client
+    if client is None:
+        return False
+    if client._connected:
+        return True
+    return time.monotonic() - client._last_reconnect_attempt >= client._reconnect_interval
+
+
+def _send_worker(pending: queue.SimpleQueue[Callable[[], None]]) -> None:
+    """Run queued tray sends one at a time, for the life of the process."""
+    while True:
+        send = pending.get()
+        try:
+            send()
+        except Exception:
+            pass  # Tray logging is best-effort
+
+
+def log_tool_call_nowait(tool_name: str, **kwargs) -> None:
+    """Queue log_tool_call() on a background thread and return immediately.
+
+    Keeps tray pipe I/O (including rate-limited reconnects) off the tool
+    response path. A single worker thread preserves message order and keeps
+    the connection from being written by two threads at once. The worker is
+    a daemon thread, so a send stuck on a tray that stopped reading never
+    holds up interpreter exit.
+
+    Args:
+        tool_name: Name of the tool (e.g. 'read', 'modify', 'delete')
+        **kwargs: Passed through to log_tool_call().
+    """
+    global _send_queue
+    if not tray_available():
+        return
+    if _send_queue is None:
+        with _send_queue_lock:
+            if _send_queue is None:
+                pending: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+                threading.Thread(
+                    target=_send_worker, args=(pending,), name="lineage-tray", daemon=True
+                ).start()
+                _send_queue = pending
+    _send_queue.put(functools.partial(log_tool_call, tool_name, **kwargs))
+
+
 def update_tray_client_name(client_name: str | None) -> None:
     """Update tray with client name (once per session).
 
@@ -455,13 +533,9 @@ def update_tray_client_name(client_name: str | None) -> None:
     if not _tray_client._connected:
         return
 
-    # Reset flags if generation changed (reconnection happened)
-    global _first_call_sent, _client_name_sent, _known_generation
-    if _tray_client._connection_generation != _known_generation:
-        _known_generation = _tray_client._connection_generation
-        _first_call_sent = False
-        _client_name_sent = False
+    _reset_sent_flags_on_reconnect()
 
+    global _client_name_sent
     if not _client_name_sent and client_name:
         _client_name_sent = True
         try:
@@ -470,6 +544,20 @@ def update_tray_client_name(client_name: str | None) -> None:
             pass  # Tray updates are best-effort
 
 
+def _reset_sent_flags_on_reconnect() -> None:
+    """Forget what was sent if the connection generation changed.
+
+    A reconnect re-registers the session, so the tray has lost the client
+    name and file count and they must be sent again.
+    """
+    global _first_call_sent, _client_name_sent, _files_tracked_sent, _known_generation
+    if _tray_client._connection_generation != _known_generation:
+        _known_generation = _tray_client._connection_generation
+        _first_call_sent = False
+        _client_name_sent = False
+        _files_tracked_sent = None
+
+
 def init_tray_client(base_dir: str) -> TrayClient | None:
     """Initialize and connect the tray client.
 